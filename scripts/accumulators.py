@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Mergeable summary statistics for sharded corpus analysis.
+Accumulators keep count, exact sum, min and max, so partial results computed
+on different machines merge to exactly what a single pass would produce,
+whatever the shard count or merge order.
+"""
+
+import hashlib
+import json
+import os
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+
+class Accumulator:
+    """Count, sum, min and max of a stream of numbers."""
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.total = Fraction(0)  # Exact, so the merge order cannot change the result
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value: Union[int, float]):
+        self.count += 1
+        self.total += Fraction(value)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def merge(self, other: 'Accumulator') -> 'Accumulator':
+        self.count += other.count
+        self.total += other.total
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                self.minimum = value if self.minimum is None else min(self.minimum, value)
+                self.maximum = value if self.maximum is None else max(self.maximum, value)
+        return self
+
+    @property
+    def sum(self) -> float:
+        return float(self.total)
+
+    @property
+    def mean(self) -> float:
+        return float(self.total / self.count) if self.count else 0.0
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'sum': str(self.total), 'min': self.minimum, 'max': self.maximum}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Accumulator':
+        accumulator = cls()
+        accumulator.count = data['count']
+        accumulator.total = Fraction(data['sum'])
+        accumulator.minimum = data['min']
+        accumulator.maximum = data['max']
+        return accumulator
+
+
+class AccumulatorSet(dict):
+    """Named accumulators, created on first use."""
+
+    def __missing__(self, name: str) -> Accumulator:
+        accumulator = self[name] = Accumulator()
+        return accumulator
+
+    def add(self, name: str, value: Union[int, float]):
+        self[name].add(value)
+
+    def merge(self, other: 'AccumulatorSet') -> 'AccumulatorSet':
+        for name, accumulator in other.items():
+            self[name].merge(accumulator)
+        return self
+
+    def to_dict(self) -> Dict:
+        return {name: accumulator.to_dict() for name, accumulator in sorted(self.items())}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AccumulatorSet':
+        accumulators = cls()
+        for name, values in data.items():
+            accumulators[name] = Accumulator.from_dict(values)
+        return accumulators
+
+
+# Sharding
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse an "INDEX/COUNT" shard spec such as "0/4"."""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard must look like INDEX/COUNT, got {spec!r}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be in 0..{count - 1}, got {spec!r}")
+    return index, count
+
+
+def shard_of(video_id: str, shard_count: int) -> int:
+    """Stable shard assignment (Python's hash() is salted per process)."""
+    digest = hashlib.sha1(video_id.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count
+
+
+def partial_file(partials_dir: Path, prefix: str, shard: Tuple[int, int]) -> Path:
+    index, count = shard
+    return partials_dir / f"{prefix}-shard-{index}-of-{count}.json"
+
+
+def write_partial(partials_dir: Path, prefix: str, shard: Tuple[int, int], payload: Dict) -> Path:
+    """Atomically write one shard's partial result."""
+    partials_dir.mkdir(parents=True, exist_ok=True)
+    output_file = partial_file(partials_dir, prefix, shard)
+    tmp_file = output_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump({**payload, 'shard': list(shard)}, f, indent=2)
+    os.replace(tmp_file, output_file)
+    return output_file
+
+
+def load_partials(partials_dir: Path, prefix: str, shard_count: Optional[int] = None) -> List[Dict]:
+    """Load a complete set of shard partials, in shard order.
+
+    Raises ValueError if shards are missing or come from different shard counts.
+    """
+    by_count: Dict[int, Dict[int, Dict]] = {}
+    for path in sorted(partials_dir.glob(f"{prefix}-shard-*-of-*.json")):
+        with open(path, 'r') as f:
+            partial = json.load(f)
+        index, count = partial['shard']
+        by_count.setdefault(count, {})[index] = partial
+
+    if shard_count is None:
+        if len(by_count) > 1:
+            raise ValueError(f"{prefix} partials in {partials_dir} mix shard counts {sorted(by_count)}; "
+                             "pass the shard count explicitly")
+        shard_count = next(iter(by_count), None)
+    if not shard_count:
+        raise ValueError(f"No {prefix} partials found in {partials_dir}")
+
+    partials = by_count.get(shard_count, {})
+    missing = [index for index in range(shard_count) if index not in partials]
+    if missing:
+        raise ValueError(f"Missing {prefix} shards {missing} of {shard_count} in {partials_dir}")
+    return [partials[index] for index in range(shard_count)]
+
+
+def merge_accumulator_sets(sets: Iterable[AccumulatorSet]) -> AccumulatorSet:
+    merged = AccumulatorSet()
+    for accumulators in sets:
+        merged.merge(accumulators)
+    return merged
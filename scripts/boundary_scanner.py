@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Streaming story boundary scanner.
+Matches all story markers in one pass over the continuous de-duplicated word
+stream, so markers split across caption segments are still found.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Characters assumed for an unbounded repeat ("\s+", "[^"']+") when sizing the carry window
+UNBOUNDED_REPEAT_CHARS = 60
+
+# Segments are batched into blocks of roughly this many characters per search
+DEFAULT_BLOCK_CHARS = 16384
+
+
+class BoundaryHit(NamedTuple):
+    """A story marker match in the continuous transcript stream."""
+    char_offset: int  # Offset in the segment texts joined with single spaces
+    time: float  # Start time of the segment where the match begins
+    segment_index: int
+    text: str
+
+
+def _max_width(subpattern, repeat_chars: int) -> int:
+    """Longest text a parsed pattern can match, with unbounded repeats capped at repeat_chars."""
+    width = 0
+    for op, av in subpattern:
+        name = str(op)
+        if name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+            low, high, item = av
+            item_width = _max_width(item, repeat_chars)
+            width += item_width * high if high < sre_parse.MAXREPEAT else max(item_width * low, repeat_chars)
+        elif name in ('SUBPATTERN', 'ATOMIC_GROUP'):
+            width += _max_width(av[-1], repeat_chars)
+        elif name == 'BRANCH':
+            width += max(_max_width(branch, repeat_chars) for branch in av[1])
+        elif name in ('AT', 'ASSERT', 'ASSERT_NOT'):
+            continue  # Zero-width
+        else:
+            width += 1
+    return width
+
+
+def marker_width(patterns: List[str], repeat_chars: int = UNBOUNDED_REPEAT_CHARS) -> int:
+    """Longest marker text any of the patterns can match."""
+    return max((_max_width(sre_parse.parse(pattern), repeat_chars) for pattern in patterns), default=0)
+
+
+class BoundaryScanner:
+    """Single compiled scanner over all marker patterns with a carry-over window."""
+
+    def __init__(self, patterns: List[str], carry_chars: Optional[int] = None,
+                 block_chars: int = DEFAULT_BLOCK_CHARS):
+        # Markers must start on a word boundary ("history 5" is not "story 5"),
+        # which also lets the engine skip mid-word positions cheaply
+        self.pattern = re.compile(r'\b(?:' + '|'.join(f'(?:{pattern})' for pattern in patterns) + ')',
+                                  re.IGNORECASE)
+        # A match straddling a block edge must fit in the carry window
+        self.carry_chars = carry_chars if carry_chars is not None else marker_width(patterns)
+        self.block_chars = max(block_chars, self.carry_chars)
+
+    def scan(self, segments: Iterable[Tuple[float, str]]) -> Iterator[BoundaryHit]:
+        """Yield marker hits from (start_time, text) segments in stream order."""
+        buffer = ''
+        base = 0  # Stream offset of buffer[0]
+        scan_pos = 0  # Buffer index where the next search starts
+        starts: List[int] = []  # Stream offsets of segments still in the buffer
+        segment_info: List[Tuple[int, float]] = []  # (segment_index, time) aligned with starts
+
+        index = -1
+        for index, (time, text) in enumerate(segments):
+            if buffer:
+                buffer += ' '
+            starts.append(base + len(buffer))
+            segment_info.append((index, time))
+            buffer += text
+
+            if len(buffer) - scan_pos < self.block_chars:
+                continue
+
+            hits, scan_pos = self._search(buffer, base, scan_pos, starts, segment_info, final=False)
+            yield from hits
+
+            # Keep only the tail that may still start a match, plus one character
+            # of left context so the leading \b is not satisfied by the cut
+            keep_from = scan_pos - 1
+            if keep_from > 0:
+                buffer = buffer[keep_from:]
+                base += keep_from
+                scan_pos -= keep_from
+                first = max(0, bisect_right(starts, base) - 1)
+                del starts[:first]
+                del segment_info[:first]
+
+        if index >= 0:
+            hits, _ = self._search(buffer, base, scan_pos, starts, segment_info, final=True)
+            yield from hits
+
+    def _search(self, buffer: str, base: int, scan_pos: int, starts: List[int],
+                segment_info: List[Tuple[int, float]], final: bool) -> Tuple[List[BoundaryHit], int]:
+        """Find complete matches in the buffer; returns hits and the next scan position."""
+        hits = []
+        next_pos = scan_pos
+        for match in self.pattern.finditer(buffer, scan_pos):
+            if match.end() == len(buffer) and not final:
+                # The match might still grow with the next segment (e.g. "story 1" -> "story 12")
+                return hits, match.start()
+            char_offset = base + match.start()
+            segment_index, time = segment_info[bisect_right(starts, char_offset) - 1]
+            hits.append(BoundaryHit(char_offset, time, segment_index, match.group(0)))
+            next_pos = match.end()
+
+        # Anything before the carry window can no longer start a match
+        return hits, max(next_pos, len(buffer) - self.carry_chars)
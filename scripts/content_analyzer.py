@@ -9,30 +9,75 @@ import json
 import os
 import subprocess
 import sys
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import logging
+import threading
+
+from corpus_store import CorpusStore
+from ingest_engine import IngestEngine
+from transcript_cache import TranscriptCache
+from transcript_index import TranscriptIndex
+from transcript_store import TranscriptStore
+
+try:
+    import yt_dlp
+except ImportError:
+    yt_dlp = None
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Number of most recent video ids remembered per channel (survives deleted videos)
+SYNC_CURSOR_IDS = 20
+
 class YouTubeTranscriptAnalyzer:
     """Analyzes YouTube horror channels by extracting transcripts and metadata."""
     
-    def __init__(self, output_dir: str = "research"):
+    def __init__(self, output_dir: str = "research", ytdlp_cmd: Optional[List[str]] = None):
         self.output_dir = Path(output_dir)
+        
+        # An explicit command (e.g. the offline stand-in) disables the in-process library
+        self.ytdlp_cmd = ytdlp_cmd or ['yt-dlp']
+        self.use_ytdlp_library = yt_dlp is not None and ytdlp_cmd is None
         self.transcripts_dir = self.output_dir / "transcripts"
         self.metadata_dir = self.output_dir / "metadata"
         
         # Create directories if they don't exist
         self.transcripts_dir.mkdir(parents=True, exist_ok=True)
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Downloaded caption tracks are deduplicated into one blob per video
+        self.transcript_store = TranscriptStore(self.output_dir)
+        
+        # Parsed transcripts are cached for the analysis phases
+        self.transcript_cache = TranscriptCache(self.output_dir / ".cache" / "transcripts")
+        
+        # Research corpus (channels, videos, metadata, transcript files)
+        self.corpus_store = CorpusStore.open(self.output_dir)
+        
+        # Positional phrase index, updated with every ingested transcript
+        self.transcript_index = TranscriptIndex(self.output_dir / ".cache" / "index")
+        
+        # Per-channel high-water marks for incremental sync
+        self.sync_state_file = self.output_dir / "sync_state.json"
+        self.sync_state = self._load_sync_state()
+        self._pending_cursors = {}
+        self._listings = {}  # channel url -> ids listed this run, newest first
+        self._sync_lock = threading.Lock()
+        
+        # In-process yt-dlp sessions (one per ingest thread) when the library is installed
+        self._thread_state = threading.local()
     
     def check_dependencies(self) -> bool:
         """Check if yt-dlp is installed."""
+        if self.use_ytdlp_library:
+            logger.info(f"yt-dlp version: {yt_dlp.version.__version__} (in-process)")
+            return True
         try:
-            result = subprocess.run(['yt-dlp', '--version'], 
+            result = subprocess.run([*self.ytdlp_cmd, '--version'], 
                                   capture_output=True, text=True, check=True)
             logger.info(f"yt-dlp version: {result.stdout.strip()}")
             return True
@@ -54,83 +99,172 @@ class YouTubeTranscriptAnalyzer:
             return []
     
     def extract_channel_videos(self, channel_url: str, min_views: int = 100000, 
-                             max_videos: int = 20) -> List[Dict]:
-        """Extract video information from a YouTube channel."""
+                             max_videos: int = 20, incremental: bool = False) -> List[Dict]:
+        """Extract video information from a YouTube channel.
+        
+        In incremental mode listing stops at the first video already seen by a
+        previous sync of this channel.
+        """
         logger.info(f"Extracting videos from channel: {channel_url}")
         
         # Ensure channel URL has /videos suffix for yt-dlp
-        if not channel_url.endswith('/videos'):
-            channel_url = channel_url.rstrip('/') + '/videos'
+        listing_url = channel_url
+        if not listing_url.endswith('/videos'):
+            listing_url = listing_url.rstrip('/') + '/videos'
+        
+        known_ids = set()
+        if incremental:
+            known_ids = set(self.sync_state.get(channel_url, {}).get('recent_ids', []))
         
-        # yt-dlp command to get video information
+        # yt-dlp command to get video information, streamed newest first
         cmd = [
-            'yt-dlp',
+            *self.ytdlp_cmd,
             '--flat-playlist',
+            '--lazy-playlist',
             '--print', '%(id)s|%(title)s|%(view_count)s|%(duration)s|%(upload_date)s',
             '--playlist-end', str(max_videos),
-            channel_url
+            listing_url
         ]
         
+        videos = []
+        listed = []
+        reached_known = False
+        
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            videos = []
-            
-            for line in result.stdout.strip().split('\n'):
-                if '|' in line:
-                    parts = line.split('|')
-                    if len(parts) >= 4:
-                        # The format is: ID|title (possibly with |)|views|duration|date
-                        # We need to find the last 3 parts (views, duration, date) and reconstruct title
-                        video_id = parts[0]
-                        
-                        # Last parts are: views, duration, upload_date
-                        view_count = parts[-3] if len(parts) >= 3 else 'NA'
-                        duration = parts[-2] if len(parts) >= 2 else 'NA'
-                        upload_date = parts[-1] if len(parts) >= 1 else 'NA'
-                        
-                        # Title is everything between ID and the last 3 parts
-                        title_parts = parts[1:-3] if len(parts) > 4 else parts[1:-2] if len(parts) == 4 else [parts[1]]
-                        title = '|'.join(title_parts).strip()
-                        
-                        # Filter by view count
-                        try:
-                            views = int(view_count) if view_count != 'NA' else 0
-                            if views >= min_views:
-                                videos.append({
-                                    'id': video_id,
-                                    'title': title,
-                                    'view_count': views,
-                                    'duration': duration,
-                                    'upload_date': upload_date,
-                                    'url': f'https://www.youtube.com/watch?v={video_id}'
-                                })
-                        except (ValueError, TypeError):
-                            logger.warning(f"Could not parse video data: {line}")
-                            continue
-            
-            logger.info(f"Found {len(videos)} videos with >= {min_views} views")
-            return videos
-            
-        except subprocess.CalledProcessError as e:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        except FileNotFoundError as e:
             logger.error(f"Error extracting videos: {e}")
             return []
+        
+        try:
+            for line in process.stdout:
+                video = self._parse_listing_line(line.strip())
+                if not video:
+                    continue
+                
+                if video['id'] in known_ids:
+                    reached_known = True
+                    break
+                
+                listed.append(video)
+                if video['view_count'] >= min_views:
+                    videos.append(video)
+        finally:
+            if process.poll() is None:
+                # Stop enumerating; everything further down is already known
+                process.terminate()
+            process.wait()
+        
+        with self._sync_lock:
+            self._listings[channel_url] = [video['id'] for video in listed]
+        
+        if process.returncode and not reached_known:
+            logger.error(f"Error extracting videos: yt-dlp exited with status {process.returncode}")
+            return []
+        
+        if incremental and reached_known:
+            logger.info(f"Reached previously synced content after {len(listed)} new videos")
+        
+        logger.info(f"Found {len(videos)} videos with >= {min_views} views")
+        return videos
+    
+    def _parse_listing_line(self, line: str) -> Optional[Dict]:
+        """Parse one ID|title|views|duration|date line printed by yt-dlp."""
+        if '|' not in line:
+            return None
+        
+        parts = line.split('|')
+        if len(parts) < 4:
+            return None
+        
+        # The format is: ID|title (possibly with |)|views|duration|date
+        # We need to find the last 3 parts (views, duration, date) and reconstruct title
+        video_id = parts[0]
+        
+        # Last parts are: views, duration, upload_date
+        view_count = parts[-3] if len(parts) >= 3 else 'NA'
+        duration = parts[-2] if len(parts) >= 2 else 'NA'
+        upload_date = parts[-1] if len(parts) >= 1 else 'NA'
+        
+        # Title is everything between ID and the last 3 parts
+        title_parts = parts[1:-3] if len(parts) > 4 else parts[1:-2] if len(parts) == 4 else [parts[1]]
+        title = '|'.join(title_parts).strip()
+        
+        try:
+            views = int(view_count) if view_count != 'NA' else 0
+        except (ValueError, TypeError):
+            logger.warning(f"Could not parse video data: {line}")
+            return None
+        
+        return {
+            'id': video_id,
+            'title': title,
+            'view_count': views,
+            'duration': duration,
+            'upload_date': upload_date,
+            'url': f'https://www.youtube.com/watch?v={video_id}'
+        }
+    
+    def _load_sync_state(self) -> Dict:
+        """Load per-channel sync cursors."""
+        try:
+            with open(self.sync_state_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            logger.warning(f"Ignoring unreadable sync state {self.sync_state_file}: {e}")
+            return {}
+    
+    def _stage_channel_cursor(self, channel_url: str, ingested: List[Dict]):
+        """Advance the channel cursor; committed once the run finishes.
+        
+        Listing stops at the first known id, so an id may only become known
+        once every video listed below it is synced. The cursor moves up from
+        the previous sync point through consecutive ingested videos and stops
+        at the first failed or below-threshold one, which is listed again next run.
+        """
+        ingested_ids = {video['id'] for video in ingested}
+        with self._sync_lock:
+            listed_ids = self._listings.get(channel_url, [])
+        
+        synced_ids = []
+        for video_id in reversed(listed_ids):
+            if video_id not in ingested_ids:
+                break
+            synced_ids.insert(0, video_id)
+        if not synced_ids:
+            return
+        
+        newest = next(video for video in ingested if video['id'] == synced_ids[0])
+        previous_ids = self.sync_state.get(channel_url, {}).get('recent_ids', [])
+        recent_ids = synced_ids + [video_id for video_id in previous_ids if video_id not in synced_ids]
+        
+        with self._sync_lock:
+            self._pending_cursors[channel_url] = {
+                'last_video_id': newest['id'],
+                'last_upload_date': newest['upload_date'],
+                'recent_ids': recent_ids[:SYNC_CURSOR_IDS],
+                'synced_at': datetime.now().isoformat(timespec='seconds')
+            }
+    
+    def commit_sync_state(self):
+        """Persist cursors staged during this run."""
+        with self._sync_lock:
+            self.sync_state.update(self._pending_cursors)
+            self._pending_cursors = {}
+            
+            tmp_file = self.sync_state_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self.sync_state, f, indent=2)
+            os.replace(tmp_file, self.sync_state_file)
     
     def extract_transcript(self, video_url: str, video_id: str) -> Optional[Tuple[str, Dict]]:
         """Extract transcript and metadata from a single video."""
         logger.info(f"Extracting transcript for video: {video_id}")
         
-        # Check for transcript files with different language suffixes
-        possible_files = [
-            self.transcripts_dir / f"{video_id}.en-orig.vtt",
-            self.transcripts_dir / f"{video_id}.en.vtt", 
-            self.transcripts_dir / f"{video_id}.vtt"
-        ]
-        
-        transcript_file = None
-        for file_path in possible_files:
-            if file_path.exists():
-                transcript_file = file_path
-                break
+        # Stored canonical transcript, or a legacy per-track file
+        transcript_file = self.transcript_store.resolve(video_id)
         
         metadata_file = self.metadata_dir / f"{video_id}.json"
         
@@ -141,92 +275,93 @@ class YouTubeTranscriptAnalyzer:
                 metadata = json.load(f)
             return str(transcript_file), metadata
         
-        # Extract transcript (use en-orig for original English captions)
-        transcript_cmd = [
-            'yt-dlp',
+        try:
+            # Subtitles and metadata come from a single yt-dlp run
+            video_info = self._fetch_video_info(video_url, video_id)
+        except Exception as e:
+            # CalledProcessError from the CLI, DownloadError from the library
+            logger.warning(f"Failed to extract transcript for {video_id}: {e}")
+            return None
+        
+        if not video_info:
+            return None
+        
+        # Keep one canonical blob of the caption tracks that were written
+        transcript_file = self.transcript_store.ingest_video(video_id, remove_sources=True)
+        if not transcript_file:
+            logger.warning(f"No English captions available for {video_id}")
+            return None
+        
+        metadata = {
+            'id': video_info.get('id', video_id),
+            'title': video_info.get('title', ''),
+            'view_count': video_info.get('view_count', 0) or 0,
+            'like_count': video_info.get('like_count', 0) or 0,
+            'duration': str(video_info.get('duration', '')),
+            'upload_date': video_info.get('upload_date', ''),
+            'description': (video_info.get('description', '') or '')[:1000],  # Truncate long descriptions
+            'url': video_url,
+            'transcript_file': str(transcript_file)
+        }
+        
+        # Save metadata  
+        with open(metadata_file, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        
+        return str(transcript_file), metadata
+    
+    def _ydl_session(self):
+        """Per-thread YoutubeDL instance, reused across videos.
+        
+        All options are fixed at construction (yt-dlp processes the output
+        template in __init__); the %(id)s template names each video's files.
+        """
+        session = getattr(self._thread_state, 'ydl', None)
+        if session is None:
+            session = yt_dlp.YoutubeDL({
+                'quiet': True,
+                'no_warnings': True,
+                'writeautomaticsub': True,
+                'subtitleslangs': ['en-orig', 'en'],  # Try en-orig first, fallback to en
+                'subtitlesformat': 'vtt',
+                'skip_download': True,
+                'outtmpl': {'default': str(self.transcripts_dir / '%(id)s.%(ext)s')},
+            })
+            self._thread_state.ydl = session
+        return session
+    
+    def _fetch_video_info(self, video_url: str, video_id: str) -> Optional[Dict]:
+        """Write subtitles for a video and return its info dict in one yt-dlp run."""
+        if self.use_ytdlp_library:
+            return self._ydl_session().extract_info(video_url, download=True)
+        
+        output_template = str(self.transcripts_dir / f"{video_id}.%(ext)s")
+        cmd = [
+            *self.ytdlp_cmd,
             '--write-auto-subs',
             '--sub-langs', 'en-orig,en',  # Try en-orig first, fallback to en
             '--sub-format', 'vtt',
             '--skip-download',
-            '--output', str(self.transcripts_dir / f"{video_id}.%(ext)s"),
-            video_url
-        ]
-        
-        # Extract metadata using JSON format to avoid parsing issues
-        metadata_cmd = [
-            'yt-dlp',
             '--dump-json',
-            '--skip-download',
+            '--no-simulate',  # --dump-json alone would not write the subtitles
+            '--output', output_template,
             video_url
         ]
-        
-        try:
-            # Get transcript
-            subprocess.run(transcript_cmd, capture_output=True, check=True)
-            
-            # Get metadata as JSON
-            result = subprocess.run(metadata_cmd, capture_output=True, text=True, check=True)
-            
-            if result.stdout.strip():
-                video_info = json.loads(result.stdout.strip())
-                metadata = {
-                    'id': video_info.get('id', video_id),
-                    'title': video_info.get('title', ''),
-                    'view_count': video_info.get('view_count', 0) or 0,
-                    'like_count': video_info.get('like_count', 0) or 0,
-                    'duration': str(video_info.get('duration', '')),
-                    'upload_date': video_info.get('upload_date', ''),
-                    'description': (video_info.get('description', '') or '')[:1000],  # Truncate long descriptions
-                    'url': video_url,
-                    'transcript_file': str(transcript_file)
-                }
-                
-                # Save metadata  
-                with open(metadata_file, 'w') as f:
-                    json.dump(metadata, f, indent=2)
-                
-                # Find the actual transcript file that was created
-                for file_path in possible_files:
-                    if file_path.exists():
-                        return str(file_path), metadata
-            
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Failed to extract transcript for {video_id}: {e}")
-            return None
-        
-        return None
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        output = result.stdout.strip()
+        return json.loads(output.splitlines()[-1]) if output else None
     
     def clean_transcript(self, vtt_file: str) -> str:
         """Clean VTT transcript file to plain text."""
         try:
-            with open(vtt_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Simple VTT cleaning - extract just the text lines
-            lines = content.split('\n')
-            text_lines = []
-            
-            for line in lines:
-                line = line.strip()
-                # Skip VTT headers, timestamps, and empty lines
-                if (line and 
-                    not line.startswith('WEBVTT') and
-                    not line.startswith('NOTE') and
-                    '-->' not in line and
-                    not line.isdigit()):
-                    # Remove HTML tags and duplicate text
-                    clean_line = line.replace('<c>', '').replace('</c>', '')
-                    if clean_line and clean_line not in text_lines[-3:]:  # Avoid duplicates
-                        text_lines.append(clean_line)
-            
-            return ' '.join(text_lines)
-            
+            return self.transcript_cache.load(vtt_file).text.strip()
         except Exception as e:
             logger.error(f"Error cleaning transcript {vtt_file}: {e}")
             return ""
     
     def analyze_channels(self, config_path: str, min_views: int = 100000, 
-                        max_videos_per_channel: int = 20) -> Dict:
+                        max_videos_per_channel: int = 20, concurrency: int = 8,
+                        per_channel: int = 2, incremental: bool = False) -> Dict:
         """Main method to analyze horror channels."""
         if not self.check_dependencies():
             return {}
@@ -235,61 +370,29 @@ class YouTubeTranscriptAnalyzer:
         if not channels:
             return {}
         
-        analysis_results = {
-            'channels_analyzed': len(channels),
-            'total_videos': 0,
-            'successful_transcripts': 0,
-            'channels': {}
-        }
-        
-        for channel in channels:
-            channel_name = channel.get('name', 'unknown')
-            channel_url = channel.get('url', '')
-            
-            if not channel_url:
-                logger.warning(f"No URL provided for channel: {channel_name}")
-                continue
-            
-            logger.info(f"Analyzing channel: {channel_name}")
-            
-            # Get videos from channel
-            videos = self.extract_channel_videos(
-                channel_url, min_views, max_videos_per_channel
-            )
-            
-            channel_results = {
-                'name': channel_name,
-                'url': channel_url,
-                'videos_found': len(videos),
-                'transcripts_extracted': 0,
-                'videos': []
-            }
-            
-            # Extract transcripts for each video
-            for video in videos:
-                result = self.extract_transcript(video['url'], video['id'])
-                if result:
-                    transcript_file, metadata = result
-                    clean_text = self.clean_transcript(transcript_file)
-                    
-                    video_data = {
-                        **video,
-                        'metadata': metadata,
-                        'transcript_length': len(clean_text),
-                        'transcript_file': transcript_file
-                    }
-                    
-                    channel_results['videos'].append(video_data)
-                    channel_results['transcripts_extracted'] += 1
-                    analysis_results['successful_transcripts'] += 1
-            
-            analysis_results['channels'][channel_name] = channel_results
-            analysis_results['total_videos'] += len(videos)
+        # Every listing and transcript is committed to the corpus store as it completes
+        engine = IngestEngine(self, max_workers=concurrency, per_channel=per_channel,
+                              store=self.corpus_store)
+        run_results = engine.run(channels, min_views, max_videos_per_channel, incremental)
         
-        # Save analysis summary
+        # Export the analysis summary snapshot from the store
         summary_file = self.output_dir / 'analysis_summary.json'
-        with open(summary_file, 'w') as f:
-            json.dump(analysis_results, f, indent=2)
+        analysis_results = self.corpus_store.export_summary_file(summary_file)
+        analysis_results['ingest_seconds'] = run_results['ingest_seconds']
+        analysis_results['videos_per_minute'] = run_results['videos_per_minute']
+        
+        # Index the newly ingested transcripts as one new segment
+        ingested = [
+            (video['id'], video['transcript_file'])
+            for channel_data in run_results['channels'].values()
+            for video in channel_data['videos']
+        ]
+        self.transcript_index.update(ingested, self.transcript_cache)
+        
+        if incremental:
+            for channel_data in run_results['channels'].values():
+                self._stage_channel_cursor(channel_data['url'], channel_data['videos'])
+            self.commit_sync_state()
         
         logger.info(f"Analysis complete. Results saved to {summary_file}")
         return analysis_results
@@ -307,6 +410,12 @@ def main():
                        help='Maximum videos per channel (default: 20)')
     parser.add_argument('--output', default='research',
                        help='Output directory (default: research)')
+    parser.add_argument('--concurrency', type=int, default=8,
+                       help='Maximum concurrent yt-dlp jobs (default: 8)')
+    parser.add_argument('--per-channel', type=int, default=2,
+                       help='Maximum concurrent downloads per channel (default: 2)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only list videos newer than the last sync of each channel')
     
     args = parser.parse_args()
     
@@ -315,13 +424,17 @@ def main():
         results = analyzer.analyze_channels(
             args.channels, 
             args.min_views,
-            args.max_videos
+            args.max_videos,
+            args.concurrency,
+            args.per_channel,
+            args.incremental
         )
         
         print(f"\nAnalysis Summary:")
         print(f"Channels analyzed: {results.get('channels_analyzed', 0)}")
         print(f"Total videos found: {results.get('total_videos', 0)}")
         print(f"Successful transcripts: {results.get('successful_transcripts', 0)}")
+        print(f"Throughput: {results.get('videos_per_minute', 0)} videos/min")
     else:
         print("Use --extract-transcripts to start analysis")
 
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed research corpus store.
+Holds channels, videos, metadata snapshots and transcript files in indexed
+tables with transactional upserts. analysis_summary.json is exported from it
+as a read-only snapshot and imported on first use.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    name TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS videos (
+    id TEXT PRIMARY KEY,
+    channel_name TEXT NOT NULL REFERENCES channels(name),
+    title TEXT,
+    view_count INTEGER,
+    duration TEXT,
+    upload_date TEXT,
+    url TEXT,
+    first_seen TEXT NOT NULL,
+    listing_position INTEGER NOT NULL,
+    transcript_length INTEGER
+);
+CREATE INDEX IF NOT EXISTS videos_by_channel ON videos(channel_name, first_seen DESC, listing_position);
+
+CREATE TABLE IF NOT EXISTS metadata_snapshots (
+    video_id TEXT NOT NULL REFERENCES videos(id),
+    captured_at TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    PRIMARY KEY (video_id, captured_at)
+);
+
+CREATE TABLE IF NOT EXISTS transcript_files (
+    video_id TEXT NOT NULL REFERENCES videos(id),
+    path TEXT NOT NULL,
+    added_at TEXT NOT NULL,
+    PRIMARY KEY (video_id, path)
+);
+"""
+
+
+class CorpusStore:
+    """Indexed store of the research corpus."""
+
+    def __init__(self, db_path: Union[str, Path] = "research/corpus.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, research_dir: Union[str, Path] = "research") -> 'CorpusStore':
+        """Open the store in a research directory, importing analysis_summary.json if empty."""
+        research_dir = Path(research_dir)
+        store = cls(research_dir / "corpus.db")
+        summary_file = research_dir / "analysis_summary.json"
+        if store.is_empty() and summary_file.exists():
+            try:
+                with open(summary_file, 'r') as f:
+                    store.import_summary(json.load(f))
+                logger.info(f"Imported {summary_file} into {store.db_path}")
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Could not import {summary_file}: {e}")
+        return store
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements atomically; rolls back on error."""
+        with self._lock:
+            try:
+                yield self.conn
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM channels LIMIT 1").fetchone() is None
+
+    # Writes
+
+    def upsert_channel(self, name: str, url: str):
+        with self.transaction() as conn:
+            self._upsert_channel(conn, name, url)
+
+    def upsert_video(self, channel_name: str, video: Dict, position: int = 0):
+        """Insert or update a listed video; metadata and transcript file are optional."""
+        with self.transaction() as conn:
+            self._upsert_video(conn, channel_name, video, position, _now())
+
+    def upsert_videos(self, channel_name: str, channel_url: str, videos: List[Dict]):
+        """Record a channel listing in one transaction (positions follow list order)."""
+        now = _now()
+        with self.transaction() as conn:
+            self._upsert_channel(conn, channel_name, channel_url)
+            for position, video in enumerate(videos):
+                self._upsert_video(conn, channel_name, video, position, now)
+
+    def import_summary(self, summary: Dict):
+        """Load an analysis_summary.json document."""
+        now = _now()
+        with self.transaction() as conn:
+            for channel_name, channel_data in summary.get('channels', {}).items():
+                self._upsert_channel(conn, channel_name, channel_data.get('url', ''))
+                for position, video in enumerate(channel_data.get('videos', [])):
+                    self._upsert_video(conn, channel_name, video, position, now)
+
+    def _upsert_channel(self, conn: sqlite3.Connection, name: str, url: str):
+        conn.execute(
+            """INSERT INTO channels (name, url, updated_at) VALUES (?, ?, ?)
+               ON CONFLICT(name) DO UPDATE SET url = excluded.url, updated_at = excluded.updated_at""",
+            (name, url, _now())
+        )
+
+    def _upsert_video(self, conn: sqlite3.Connection, channel_name: str, video: Dict,
+                      position: int, now: str):
+        # first_seen is kept from the first insert; listing_position follows the latest listing
+        conn.execute(
+            """INSERT INTO videos (id, channel_name, title, view_count, duration, upload_date, url,
+                                   first_seen, listing_position, transcript_length)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET
+                   channel_name = excluded.channel_name,
+                   title = excluded.title,
+                   view_count = excluded.view_count,
+                   duration = excluded.duration,
+                   upload_date = excluded.upload_date,
+                   url = excluded.url,
+                   listing_position = excluded.listing_position,
+                   transcript_length = COALESCE(excluded.transcript_length, videos.transcript_length)""",
+            (video['id'], channel_name, video.get('title', ''), video.get('view_count', 0),
+             str(video.get('duration', '')), video.get('upload_date', ''), video.get('url', ''),
+             now, position, video.get('transcript_length'))
+        )
+
+        metadata = video.get('metadata')
+        if metadata:
+            conn.execute(
+                "INSERT OR REPLACE INTO metadata_snapshots (video_id, captured_at, metadata) VALUES (?, ?, ?)",
+                (video['id'], now, json.dumps(metadata))
+            )
+
+        transcript_file = video.get('transcript_file')
+        if transcript_file:
+            conn.execute(
+                "INSERT OR IGNORE INTO transcript_files (video_id, path, added_at) VALUES (?, ?, ?)",
+                (video['id'], str(transcript_file), now)
+            )
+
+    # Reads
+
+    def channel_names(self) -> List[str]:
+        with self._lock:
+            rows = self.conn.execute("SELECT name FROM channels ORDER BY rowid").fetchall()
+        return [row['name'] for row in rows]
+
+    def get_video(self, video_id: str) -> Optional[Dict]:
+        """Video in analysis summary format, or None."""
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM videos WHERE id = ?", (video_id,)).fetchone()
+            return self._video_dict(row) if row else None
+
+    def channel_videos(self, channel_name: str, with_transcripts: bool = True) -> List[Dict]:
+        """Videos of a channel, newest first: by first sync, then by position in the latest listing."""
+        query = "SELECT * FROM videos WHERE channel_name = ?"
+        if with_transcripts:
+            query += " AND EXISTS (SELECT 1 FROM transcript_files t WHERE t.video_id = videos.id)"
+        query += " ORDER BY first_seen DESC, listing_position"
+        with self._lock:
+            rows = self.conn.execute(query, (channel_name,)).fetchall()
+            return [self._video_dict(row) for row in rows]
+
+    def all_videos(self) -> Dict[str, Dict]:
+        """Every video with a transcript, keyed by id."""
+        return {
+            video['id']: video
+            for channel_name in self.channel_names()
+            for video in self.channel_videos(channel_name)
+        }
+
+    def _video_dict(self, row: sqlite3.Row) -> Dict:
+        video = {
+            'id': row['id'],
+            'title': row['title'],
+            'view_count': row['view_count'],
+            'duration': row['duration'],
+            'upload_date': row['upload_date'],
+            'url': row['url'],
+        }
+
+        snapshot = self.conn.execute(
+            "SELECT metadata FROM metadata_snapshots WHERE video_id = ? ORDER BY captured_at DESC LIMIT 1",
+            (row['id'],)
+        ).fetchone()
+        if snapshot:
+            video['metadata'] = json.loads(snapshot['metadata'])
+
+        if row['transcript_length'] is not None:
+            video['transcript_length'] = row['transcript_length']
+
+        transcript = self.conn.execute(
+            "SELECT path FROM transcript_files WHERE video_id = ? ORDER BY added_at DESC LIMIT 1",
+            (row['id'],)
+        ).fetchone()
+        if transcript:
+            video['transcript_file'] = transcript['path']
+        return video
+
+    def export_summary(self) -> Dict:
+        """Build a document in the analysis_summary.json schema."""
+        summary = {
+            'channels_analyzed': 0,
+            'total_videos': 0,
+            'successful_transcripts': 0,
+            'channels': {}
+        }
+
+        with self._lock:
+            for channel in self.conn.execute("SELECT name, url FROM channels ORDER BY rowid").fetchall():
+                videos_found = self.conn.execute(
+                    "SELECT COUNT(*) FROM videos WHERE channel_name = ?", (channel['name'],)
+                ).fetchone()[0]
+                videos = self.channel_videos(channel['name'])
+
+                summary['channels'][channel['name']] = {
+                    'name': channel['name'],
+                    'url': channel['url'],
+                    'videos_found': videos_found,
+                    'transcripts_extracted': len(videos),
+                    'videos': videos
+                }
+                summary['total_videos'] += videos_found
+                summary['successful_transcripts'] += len(videos)
+
+        summary['channels_analyzed'] = len(summary['channels'])
+        return summary
+
+    def export_summary_file(self, summary_file: Union[str, Path]) -> Dict:
+        """Write the analysis_summary.json snapshot."""
+        summary = self.export_summary()
+        with open(summary_file, 'w') as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='microseconds')
@@ -10,28 +10,75 @@ import os
 import subprocess
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
+import numpy as np
+
+from corpus_store import CorpusStore
+from fabric_cache import DEFAULT_MAX_BYTES, FabricResultCache, text_hash
+from fabric_chunking import (DEFAULT_CHUNK_TOKENS, TextChunk, chunk_input, chunk_transcript,
+                             estimate_tokens, reduce_input)
+from fabric_engine import FabricEngine, FabricTask
+from structure_analyzer import SEGMENTATION_MODES, ContentStructureAnalyzer
+from transcript_cache import ParsedTranscript, TranscriptCache
+from transcript_store import TranscriptStore
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Story mode sends each story's opening window to hook patterns
+HOOK_WINDOW_SECONDS = 60
+
+# Top-level fields of a corpus store video record
+LISTING_FIELDS = ('title', 'view_count', 'duration', 'upload_date', 'url')
+
 class FabricAnalyzer:
     """Uses Fabric AI to analyze horror story transcripts for patterns."""
     
     def __init__(self, input_dir: str = "research/transcripts", 
-                 output_dir: str = "research/fabric_analysis"):
+                 output_dir: str = "research/fabric_analysis", model: Optional[str] = None,
+                 use_cache: bool = True, cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                 chunk_tokens: int = DEFAULT_CHUNK_TOKENS, per_story: bool = False,
+                 segmentation: Optional[str] = None):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Parsed transcripts are cached next to the transcripts directory
+        self.transcript_cache = TranscriptCache(self.input_dir.parent / ".cache" / "transcripts")
+        
+        # One canonical transcript per video id
+        self.transcript_store = TranscriptStore(self.input_dir.parent)
+        
+        # Fabric outputs are cached by (text hash, system prompt hash, model)
+        self.result_cache = (FabricResultCache(self.input_dir.parent / ".cache" / "fabric", cache_max_bytes)
+                             if use_cache else None)
+        self.model = model
+        self.patterns_dir = Path.home() / ".config" / "fabric" / "patterns"
+        self._prompt_hashes: Dict[str, str] = {}
+        
+        # Transcripts over this many tokens are analyzed in story-aligned chunks
+        self.chunk_tokens = chunk_tokens
+        self._structure_analyzer = None
+        
         # Fabric patterns for horror story analysis
         self.patterns = {
             'extract_story_hooks': 'extract_story_hooks',
             'analyze_pacing_structure': 'analyze_pacing_structure',
             'extract_horror_elements': 'extract_horror_elements'
         }
+        
+        # Per-story mode: the slice of each story a pattern sees ('opening' or 'story')
+        self.per_story = per_story
+        # Story markers alone miss most compilations, so per-story mode also splits at pauses
+        self.segmentation = segmentation or ('hybrid' if per_story else 'phrases')
+        self.story_scopes = {
+            'extract_story_hooks': 'opening',
+            'analyze_pacing_structure': 'story',
+            'extract_horror_elements': 'story'
+        }
     
     def check_fabric_available(self) -> bool:
         """Check if Fabric is available and configured."""
@@ -47,46 +94,54 @@ class FabricAnalyzer:
     def clean_transcript_text(self, vtt_file: Path) -> str:
         """Extract clean text from VTT transcript file."""
         try:
-            with open(vtt_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Clean VTT format to plain text
-            lines = content.split('\n')
-            text_lines = []
-            
-            for line in lines:
-                line = line.strip()
-                # Skip VTT headers, timestamps, and metadata
-                if (line and 
-                    not line.startswith('WEBVTT') and
-                    not line.startswith('NOTE') and
-                    '-->' not in line and
-                    not line.isdigit() and
-                    not line.startswith('<')):
-                    
-                    # Remove HTML-like tags
-                    clean_line = line.replace('<c>', '').replace('</c>', '')
-                    clean_line = clean_line.replace('<c.colorE5E5E5>', '').replace('</c>', '')
-                    
-                    if clean_line and len(clean_line) > 2:
-                        text_lines.append(clean_line)
-            
-            # Join and clean up
-            full_text = ' '.join(text_lines)
-            # Remove excessive whitespace
-            full_text = ' '.join(full_text.split())
-            
-            return full_text
+            return self.transcript_cache.load(vtt_file).text.strip()
             
         except Exception as e:
             logger.error(f"Error cleaning transcript {vtt_file}: {e}")
             return ""
     
-    def analyze_with_fabric(self, text: str, pattern: str) -> Optional[str]:
-        """Analyze text using a specific Fabric pattern."""
+    def model_id(self) -> str:
+        """Model Fabric will use: the --model override, else Fabric's configured default."""
+        if self.model:
+            return self.model
+        env_file = Path.home() / ".config" / "fabric" / ".env"
+        try:
+            for line in env_file.read_text().splitlines():
+                if line.startswith('DEFAULT_MODEL='):
+                    return line.split('=', 1)[1].strip().strip('"\'')
+        except OSError:
+            pass
+        return 'default'
+    
+    def prompt_hash(self, pattern: str) -> str:
+        """Hash of a pattern's system prompt, so edited patterns miss the cache."""
+        if pattern not in self._prompt_hashes:
+            system_file = self.patterns_dir / pattern / "system.md"
+            try:
+                self._prompt_hashes[pattern] = text_hash(system_file.read_text(encoding='utf-8'))
+            except OSError:
+                self._prompt_hashes[pattern] = ''
+        return self._prompt_hashes[pattern]
+    
+    def analyze_with_fabric(self, text: str, pattern: str, timeout: float = 120) -> Optional[str]:
+        """Analyze text using a specific Fabric pattern, reusing cached outputs."""
+        if self.result_cache:
+            cache_args = (text_hash(text), self.prompt_hash(pattern), self.model_id())
+            cached = self.result_cache.get(*cache_args)
+            if cached is not None:
+                return cached
+        
+        output = self._run_fabric(text, pattern, timeout)
+        if output and self.result_cache:
+            self.result_cache.put(*cache_args, output, pattern=pattern)
+        return output
+    
+    def _run_fabric(self, text: str, pattern: str, timeout: float) -> Optional[str]:
         try:
             # Run fabric with the specified pattern
             cmd = ['fabric', '--pattern', pattern]
+            if self.model:
+                cmd += ['--model', self.model]
             
             result = subprocess.run(
                 cmd,
@@ -94,7 +149,7 @@ class FabricAnalyzer:
                 text=True,
                 capture_output=True,
                 check=True,
-                timeout=120  # 2 minute timeout
+                timeout=timeout
             )
             
             return result.stdout.strip()
@@ -109,42 +164,220 @@ class FabricAnalyzer:
             logger.error(f"Unexpected error in Fabric analysis: {e}")
             return None
     
-    def analyze_transcript(self, transcript_file: Path, video_metadata: Dict) -> Dict:
-        """Analyze a single transcript file with all patterns."""
+    def story_boundaries(self, parsed: ParsedTranscript) -> List[Dict]:
+        """Stories detected by ContentStructureAnalyzer.identify_story_boundaries."""
+        if self._structure_analyzer is None:
+            self._structure_analyzer = ContentStructureAnalyzer(str(self.input_dir.parent),
+                                                                segmentation=self.segmentation)
+        return self._structure_analyzer.identify_story_boundaries(parsed)
+    
+    def chunk_text(self, transcript_file: Path, clean_text: str) -> List[TextChunk]:
+        """The whole text as one chunk, or story-aligned chunks if it exceeds the token budget."""
+        if estimate_tokens(clean_text) <= self.chunk_tokens:
+            return [TextChunk(clean_text, 0.0, 0.0)]
+        
+        parsed = self.transcript_cache.load(transcript_file)
+        return chunk_transcript(parsed, self.story_boundaries(parsed), self.chunk_tokens)
+    
+    def story_tasks(self, transcript_file: Path) -> Tuple[List[Dict], List[FabricTask]]:
+        """Per-story result entries and the Fabric tasks that fill them.
+        
+        Hook patterns get the first HOOK_WINDOW_SECONDS of each story, the
+        others the full story (chunked if it exceeds the token budget). Text
+        before the first detected story is analyzed as story 0, the intro.
+        """
+        parsed = self.transcript_cache.load(transcript_file)
+        offsets = parsed.segment_offsets
+        segment_starts = parsed.segment_starts
+        
+        stories = self.story_boundaries(parsed)
+        if not stories:
+            logger.warning(f"No stories detected in {transcript_file.name} with {self.segmentation} "
+                           "segmentation; analyzing the whole transcript as one story")
+        spans = [(story['story_number'], story['start_index'], story['end_index'], story['boundary_type'])
+                 for story in stories]
+        first_story = spans[0][1] if spans else len(parsed)
+        if first_story > 0:
+            spans.insert(0, (0, 0, first_story - 1, 'intro'))
+        
+        entries = []
+        tasks = []
+        for story_number, start_index, end_index, boundary_type in spans:
+            begin, end = int(offsets[start_index]), int(offsets[end_index + 1])
+            start_time = float(segment_starts[start_index])
+            end_time = float(parsed.segment_ends[end_index])
+            
+            # Opening window: cues starting within HOOK_WINDOW_SECONDS of the story start
+            opening_index = int(np.searchsorted(segment_starts, start_time + HOOK_WINDOW_SECONDS, side='left'))
+            opening_end = int(offsets[min(max(opening_index, start_index + 1), end_index + 1)])
+            opening_text = parsed.text[begin:opening_end].strip()
+            if not opening_text:
+                continue
+            
+            entry = {
+                'story_number': story_number,
+                'boundary_type': boundary_type,
+                'start_time': round(start_time, 2),
+                'end_time': round(end_time, 2),
+                'word_count': parsed.word_count_between(start_index, end_index),
+                'analysis': {}
+            }
+            entries.append(entry)
+            
+            scope_chunks = {
+                'opening': [TextChunk(opening_text, start_time, min(end_time, start_time + HOOK_WINDOW_SECONDS))],
+                'story': chunk_transcript(parsed, [], self.chunk_tokens, span=(begin, end))
+            }
+            label = 'intro' if story_number == 0 else f"story {story_number}"
+            for pattern_name in self.patterns:
+                chunks = scope_chunks[self.story_scopes.get(pattern_name, 'story')]
+                tasks.append(FabricTask(entry['analysis'], pattern_name, chunks, label))
+        return entries, tasks
+    
+    @staticmethod
+    def chunk_inputs(chunks: List[TextChunk]) -> List[str]:
+        """Fabric input for each chunk (a single chunk is sent as plain text)."""
+        if len(chunks) == 1:
+            return [chunks[0].text]
+        return [chunk_input(chunk, number, len(chunks)) for number, chunk in enumerate(chunks, 1)]
+    
+    def merge_chunk_outputs(self, chunks: List[TextChunk], outputs: List[Optional[str]],
+                            pattern: str, timeout: float = 120) -> Optional[str]:
+        """Reduce pass: merge per-chunk pattern outputs into one analysis.
+        
+        When the combined outputs exceed the token budget, consecutive outputs
+        are merged in groups that fit and the merges are merged again.
+        """
+        if len(outputs) == 1:
+            return outputs[0]
+        missing = sum(1 for output in outputs if not output)
+        if missing == len(outputs):
+            return None
+        if missing:
+            logger.warning(f"Merging {pattern} without {missing} of {len(outputs)} failed chunks")
+        
+        parts = [(chunk, output) for chunk, output in zip(chunks, outputs) if output]
+        while len(parts) > 1 and estimate_tokens(reduce_input(*zip(*parts))) > self.chunk_tokens:
+            merged = []
+            for group in self._reduce_groups(parts):
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                output = self.analyze_with_fabric(reduce_input(*zip(*group)), pattern, timeout)
+                if output:
+                    merged.append((TextChunk('', group[0][0].start_time, group[-1][0].end_time), output))
+                else:
+                    logger.warning(f"Dropping {len(group)} {pattern} outputs whose merge failed")
+            if not merged:
+                return None
+            logger.info(f"  Merged {len(parts)} {pattern} outputs into {len(merged)}")
+            parts = merged
+        
+        if len(parts) == 1:
+            return parts[0][1]
+        return self.analyze_with_fabric(reduce_input(*zip(*parts)), pattern, timeout)
+    
+    def _reduce_groups(self, parts: List[Tuple[TextChunk, str]]) -> List[List[Tuple[TextChunk, str]]]:
+        """Consecutive groups of outputs whose merge input fits the token budget.
+        
+        Every group but a trailing single takes at least two outputs, so each
+        round of merges shrinks the list even when single outputs are large.
+        """
+        groups = []
+        group = []
+        for part in parts:
+            if len(group) >= 2 and estimate_tokens(reduce_input(*zip(*(group + [part])))) > self.chunk_tokens:
+                groups.append(group)
+                group = []
+            group.append(part)
+        groups.append(group)
+        return groups
+    
+    def analyze_chunks(self, chunks: List[TextChunk], pattern: str, timeout: float = 120) -> Optional[str]:
+        """Run a pattern over every chunk, then merge the outputs."""
+        outputs = [self.analyze_with_fabric(text, pattern, timeout) for text in self.chunk_inputs(chunks)]
+        return self.merge_chunk_outputs(chunks, outputs, pattern, timeout)
+    
+    def prepare_analysis(self, transcript_file: Path, video_metadata: Dict,
+                         video_id: Optional[str] = None) -> Tuple[Dict, List[FabricTask]]:
+        """Result skeleton and the Fabric tasks that fill it (no tasks on failure)."""
         logger.info(f"Analyzing transcript: {transcript_file.name}")
         
         # Extract clean text
         clean_text = self.clean_transcript_text(transcript_file)
         if not clean_text:
             logger.warning(f"No text extracted from {transcript_file}")
-            return {}
+            return {}, []
         
-        # Analyze with each pattern
         analysis_results = {
-            'video_id': transcript_file.stem,
+            'video_id': video_id or self.transcript_store.video_id_of(transcript_file),
             'transcript_file': str(transcript_file),
             'text_length': len(clean_text),
             'word_count': len(clean_text.split()),
-            'metadata': video_metadata,
-            'analysis': {}
+            'estimated_tokens': estimate_tokens(clean_text),
+            'metadata': video_metadata
         }
         
-        for pattern_name, pattern_id in self.patterns.items():
-            logger.info(f"  Running pattern: {pattern_name}")
-            result = self.analyze_with_fabric(clean_text, pattern_id)
+        if self.per_story:
+            stories, tasks = self.story_tasks(transcript_file)
+            logger.info(f"  {len(stories)} stories")
+            analysis_results['stories'] = stories
+            return analysis_results, tasks
+        
+        chunks = self.chunk_text(transcript_file, clean_text)
+        if len(chunks) > 1:
+            logger.info(f"  Split into {len(chunks)} chunks of up to {self.chunk_tokens} tokens")
+        analysis_results['chunks'] = len(chunks)
+        analysis_results['analysis'] = {}
+        tasks = [FabricTask(analysis_results['analysis'], pattern_name, chunks)
+                 for pattern_name in self.patterns]
+        return analysis_results, tasks
+    
+    @staticmethod
+    def has_analysis(result: Dict) -> bool:
+        """Whether any pattern produced output, for the whole video or any story."""
+        if any(result.get('analysis', {}).values()):
+            return True
+        return any(any(story['analysis'].values()) for story in result.get('stories', []))
+    
+    def analyze_transcript(self, transcript_file: Path, video_metadata: Dict,
+                           video_id: Optional[str] = None) -> Dict:
+        """Analyze a single transcript file with all patterns."""
+        analysis_results, tasks = self.prepare_analysis(transcript_file, video_metadata, video_id)
+        if not tasks:
+            return {}
+        
+        # Analyze with each pattern
+        for task in tasks:
+            label = f" ({task.label})" if task.label else ""
+            logger.info(f"  Running pattern: {task.pattern_name}{label}")
+            result = self.analyze_chunks(task.chunks, self.patterns[task.pattern_name])
             
             if result:
-                analysis_results['analysis'][pattern_name] = result
-                logger.info(f"    ✓ {pattern_name} completed")
+                task.analysis[task.pattern_name] = result
+                logger.info(f"    ✓ {task.pattern_name} completed")
             else:
-                logger.warning(f"    ✗ {pattern_name} failed")
-                analysis_results['analysis'][pattern_name] = None
+                logger.warning(f"    ✗ {task.pattern_name} failed")
+                task.analysis[task.pattern_name] = None
         
         return analysis_results
     
+    def _write_pattern(self, pattern_dir: Path, system_prompt: str):
+        """Write a pattern's system prompt only when it changed, keeping its mtime and cache keys stable."""
+        system_file = pattern_dir / "system.md"
+        try:
+            if system_file.read_text(encoding='utf-8') == system_prompt:
+                return
+        except OSError:
+            pass
+        with open(system_file, "w") as f:
+            f.write(system_prompt)
+        self._prompt_hashes.pop(pattern_dir.name, None)
+        logger.info(f"Updated Fabric pattern {pattern_dir.name}")
+    
     def create_custom_patterns(self):
         """Create custom Fabric patterns for horror story analysis if they don't exist."""
-        patterns_dir = Path.home() / ".config" / "fabric" / "patterns"
+        patterns_dir = self.patterns_dir
         
         # Horror story hook extraction pattern
         hook_pattern_dir = patterns_dir / "extract_story_hooks"
@@ -172,8 +405,7 @@ Extract and analyze the opening hooks and attention-grabbing techniques used in
 - **Pattern**: The structural pattern of the opening"""
         
         # Write the hook pattern system prompt
-        with open(hook_pattern_dir / "system.md", "w") as f:
-            f.write(hook_system_prompt)
+        self._write_pattern(hook_pattern_dir, hook_system_prompt)
         
         # Pacing analysis pattern
         pacing_pattern_dir = patterns_dir / "analyze_pacing_structure"
@@ -200,8 +432,7 @@ Analyze the pacing structure of horror stories to identify successful tension pa
 - **Audience Retention**: Techniques to maintain engagement
 - **Pattern Formula**: Repeatable structure for similar stories"""
         
-        with open(pacing_pattern_dir / "system.md", "w") as f:
-            f.write(pacing_system_prompt)
+        self._write_pattern(pacing_pattern_dir, pacing_system_prompt)
         
         # Horror elements extraction pattern
         horror_pattern_dir = patterns_dir / "extract_horror_elements"
@@ -229,67 +460,93 @@ Extract and categorize the horror elements that make stories effective and engag
 - **Unique Aspects**: What makes this story stand out
 - **Effectiveness Rating**: How well these elements work together"""
         
-        with open(horror_pattern_dir / "system.md", "w") as f:
-            f.write(horror_system_prompt)
+        self._write_pattern(horror_pattern_dir, horror_system_prompt)
         
-        logger.info("Custom Fabric patterns created")
+        logger.info("Custom Fabric patterns ready")
     
-    def analyze_all_transcripts(self, metadata_file: str = "research/analysis_summary.json"):
-        """Analyze all available transcripts."""
+    def load_metadata(self, video_ids: List[str], research_dir: Optional[str] = None) -> Dict[str, Dict]:
+        """Metadata per video id: the corpus store record, else one built from the video's metadata JSON file."""
+        research_dir = Path(research_dir or self.input_dir.parent)
+        store_videos = CorpusStore.open(research_dir).all_videos()
+        
+        metadata = {}
+        for video_id in video_ids:
+            if video_id in store_videos:
+                metadata[video_id] = store_videos[video_id]
+                continue
+            metadata_file = research_dir / "metadata" / f"{video_id}.json"
+            try:
+                with open(metadata_file, 'r') as f:
+                    video_metadata = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                logger.warning(f"No metadata found for {video_id}")
+                continue
+            # Same shape as a corpus store record: listing fields, yt-dlp metadata nested
+            metadata[video_id] = {
+                'id': video_id,
+                **{field: video_metadata.get(field) for field in LISTING_FIELDS},
+                'metadata': video_metadata
+            }
+        
+        logger.info(f"Metadata for {len(metadata)}/{len(video_ids)} videos "
+                    f"({sum(1 for video_id in metadata if video_id in store_videos)} from the corpus store)")
+        return metadata
+    
+    def analyze_all_transcripts(self, research_dir: Optional[str] = None, concurrency: int = 4,
+                                timeout: float = 120):
+        """Analyze all available transcripts, running (transcript, pattern) jobs concurrently."""
         if not self.check_fabric_available():
             return {}
         
         # Create custom patterns
         self.create_custom_patterns()
         
-        # Load metadata
-        metadata = {}
-        if Path(metadata_file).exists():
-            with open(metadata_file, 'r') as f:
-                analysis_data = json.load(f)
-                
-            # Extract video metadata
-            for channel_data in analysis_data.get('channels', {}).values():
-                for video in channel_data.get('videos', []):
-                    metadata[video['id']] = video
-        
-        # Find transcript files
-        transcript_files = list(self.input_dir.glob("*.vtt"))
-        if not transcript_files:
+        # One canonical transcript per video, resolved through the transcript store
+        transcripts = self.transcript_store.transcripts()
+        if not transcripts:
             logger.warning(f"No VTT transcript files found in {self.input_dir}")
             return {}
         
-        logger.info(f"Found {len(transcript_files)} transcript files to analyze")
+        metadata = self.load_metadata([video_id for video_id, _ in transcripts], research_dir)
+        
+        logger.info(f"Found {len(transcripts)} transcripts to analyze "
+                    f"({len(transcripts) * len(self.patterns)} Fabric jobs, concurrency {concurrency})")
         
-        # Analyze each transcript
         all_results = {
             'analysis_timestamp': str(Path().resolve()),
-            'total_transcripts': len(transcript_files),
+            'total_transcripts': len(transcripts),
             'successful_analyses': 0,
             'patterns_used': list(self.patterns.keys()),
+            'per_story': self.per_story,
+            'segmentation': self.segmentation,
             'results': {}
         }
         
-        for transcript_file in transcript_files:
-            video_id = transcript_file.stem
-            video_metadata = metadata.get(video_id, {})
-            
-            result = self.analyze_transcript(transcript_file, video_metadata)
-            
-            if result and any(result.get('analysis', {}).values()):
-                all_results['results'][video_id] = result
-                all_results['successful_analyses'] += 1
-                
-                # Save individual result
-                output_file = self.output_dir / f"{video_id}_analysis.json"
+        def save_result(result: Dict, finished: bool):
+            # Each video's file is rewritten as its pattern jobs complete
+            if self.has_analysis(result):
+                output_file = self.output_dir / f"{result['video_id']}_analysis.json"
                 with open(output_file, 'w') as f:
                     json.dump(result, f, indent=2)
         
+        engine = FabricEngine(self, max_workers=concurrency, timeout=timeout)
+        results = engine.run(transcripts, metadata, save_result)
+        
+        for video_id, _ in transcripts:
+            result = results.get(video_id)
+            if result and self.has_analysis(result):
+                all_results['results'][video_id] = result
+                all_results['successful_analyses'] += 1
+        
+        if self.result_cache:
+            all_results['cache'] = self.result_cache.stats()
+            logger.info(f"Fabric cache: {all_results['cache']['hits']} hits, "
+                        f"{all_results['cache']['misses']} misses, {all_results['cache']['evictions']} evictions")
+        
         # Save summary
         summary_file = self.output_dir / "fabric_analysis_summary.json"
         with open(summary_file, 'w') as f:
             json.dump(all_results, f, indent=2)
-        
         logger.info(f"Analysis complete. {all_results['successful_analyses']} successful analyses.")
         logger.info(f"Results saved to {summary_file}")
         
@@ -306,18 +563,41 @@ def main():
                        help='Run specific pattern (extract_story_hooks, analyze_pacing_structure, extract_horror_elements)')
     parser.add_argument('--output', default='research/fabric_analysis',
                        help='Output directory for analysis results')
+    parser.add_argument('--concurrency', type=int, default=4,
+                       help='Concurrent Fabric calls (default: 4)')
+    parser.add_argument('--timeout', type=float, default=120,
+                       help='Seconds before a single Fabric call is abandoned (default: 120)')
+    parser.add_argument('--chunk-tokens', type=int, default=DEFAULT_CHUNK_TOKENS,
+                       help=f'Token budget per Fabric call; longer transcripts are chunked (default: {DEFAULT_CHUNK_TOKENS})')
+    parser.add_argument('--per-story', action='store_true',
+                       help='Analyze each detected story separately (hooks see only its opening)')
+    parser.add_argument('--segmentation', choices=SEGMENTATION_MODES,
+                       help='Story boundary detection (default: hybrid with --per-story, else phrases)')
+    parser.add_argument('--model',
+                       help="Fabric model to use (default: Fabric's configured model)")
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore cached Fabric outputs and call Fabric for every job')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                       help='Size bound of the Fabric result cache in MB (default: 64)')
     
     args = parser.parse_args()
     
-    analyzer = FabricAnalyzer(args.transcripts, args.output)
+    analyzer = FabricAnalyzer(args.transcripts, args.output, model=args.model, use_cache=not args.no_cache,
+                              cache_max_bytes=int(args.cache_max_mb * 1024 * 1024),
+                              chunk_tokens=args.chunk_tokens, per_story=args.per_story,
+                              segmentation=args.segmentation)
     
     if args.fabric_analysis:
-        results = analyzer.analyze_all_transcripts()
+        results = analyzer.analyze_all_transcripts(concurrency=args.concurrency, timeout=args.timeout)
         
         print(f"\nFabric Analysis Summary:")
         print(f"Total transcripts: {results.get('total_transcripts', 0)}")
         print(f"Successful analyses: {results.get('successful_analyses', 0)}")
         print(f"Patterns used: {', '.join(results.get('patterns_used', []))}")
+        cache = results.get('cache')
+        if cache:
+            print(f"Cache: {cache['hits']} hits, {cache['misses']} misses "
+                  f"({cache['hit_rate']:.0%}), {cache['entries']} entries, {cache['bytes'] / 1e6:.1f} MB")
     else:
         print("Use --fabric-analysis to start pattern analysis")
 
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of Fabric pattern outputs.
+Entries are keyed by the hash of the cleaned transcript text, the hash of the
+pattern's system prompt and the model id, so only changed transcripts, edited
+patterns or a different model trigger new LLM calls. The cache is bounded in
+size and evicts least recently used entries first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of a string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class FabricResultCache:
+    """Size-bounded, least-recently-used on-disk cache of Fabric outputs."""
+
+    def __init__(self, cache_dir: Union[str, Path] = "research/.cache/fabric",
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # Entry sizes; recency is the file's mtime, refreshed on every hit
+        self._sizes = {path.name: path.stat().st_size for path in self.cache_dir.glob("*.json")}
+        self._total_bytes = sum(self._sizes.values())
+
+    @staticmethod
+    def cache_key(content_hash: str, prompt_hash: str, model: str) -> str:
+        key = json.dumps([content_hash, prompt_hash, model])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, content_hash: str, prompt_hash: str, model: str) -> Optional[str]:
+        """Cached output, or None on a miss."""
+        entry_file = self._entry_path(self.cache_key(content_hash, prompt_hash, model))
+        try:
+            with open(entry_file, 'r') as f:
+                output = json.load(f)['output']
+            os.utime(entry_file)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return output
+
+    def put(self, content_hash: str, prompt_hash: str, model: str, output: str, pattern: str = ''):
+        """Store an output and evict old entries if the cache is over its size bound."""
+        entry_file = self._entry_path(self.cache_key(content_hash, prompt_hash, model))
+        tmp_file = entry_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({
+                'pattern': pattern,
+                'model': model,
+                'text_hash': content_hash,
+                'prompt_hash': prompt_hash,
+                'created_at': datetime.now().isoformat(),
+                'output': output
+            }, f)
+        os.replace(tmp_file, entry_file)
+
+        with self._lock:
+            size = entry_file.stat().st_size
+            self._total_bytes += size - self._sizes.get(entry_file.name, 0)
+            self._sizes[entry_file.name] = size
+            self.stores += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict(keep=entry_file.name)
+
+    def _evict(self, keep: str):
+        """Remove least recently used entries until the cache fits (caller holds the lock)."""
+        def last_used(name: str) -> float:
+            try:
+                return (self.cache_dir / name).stat().st_mtime
+            except OSError:
+                return 0.0
+
+        for name in sorted(self._sizes, key=last_used):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            (self.cache_dir / name).unlink(missing_ok=True)
+            self._total_bytes -= self._sizes.pop(name)
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._sizes),
+            'bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Token-budgeted chunking of long transcripts for Fabric.
+Multi-hour compilations exceed model context in one call, so their cleaned
+text is split into windows of at most max_tokens. Cuts are made at story
+boundaries where possible, then at sentence ends, then between caption cues.
+Each chunk is analyzed on its own and the outputs are merged by a reduce call.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from transcript_cache import ParsedTranscript
+
+DEFAULT_CHUNK_TOKENS = 6000
+CHARS_PER_TOKEN = 4  # Rough English average; only used to size chunks
+
+SENTENCE_END = re.compile(r'[.!?]["\')\]]*\s+')
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class TextChunk(NamedTuple):
+    """A window of a transcript's cleaned text."""
+    text: str
+    start_time: float  # Seconds
+    end_time: float
+
+
+def _format_time(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+def _split_span(text: str, begin: int, end: int, max_chars: int, cue_offsets: np.ndarray,
+                level: int = 0) -> List[int]:
+    """Cut positions inside [begin, end) so no piece exceeds max_chars.
+
+    Sentence ends are preferred; a sentence longer than the budget is cut
+    between cues, and a single oversized cue is cut every max_chars.
+    """
+    if end - begin <= max_chars:
+        return []
+    if level == 0:
+        candidates = [match.end() for match in SENTENCE_END.finditer(text, begin, end)]
+    elif level == 1:
+        candidates = cue_offsets[(cue_offsets > begin) & (cue_offsets < end)].tolist()
+    else:
+        return list(range(begin + max_chars, end, max_chars))
+
+    # Greedy: extend each piece to the last candidate that keeps it within budget
+    cuts = []
+    piece_start = last = begin
+    for position in candidates + [end]:
+        if position - piece_start > max_chars and last > piece_start:
+            cuts.append(last)
+            piece_start = last
+        last = position
+
+    # Pieces with no usable candidate inside fall through to the next level
+    bounds = [begin] + cuts + [end]
+    for piece_begin, piece_end in zip(bounds, bounds[1:]):
+        cuts.extend(_split_span(text, piece_begin, piece_end, max_chars, cue_offsets, level + 1))
+    return sorted(cut for cut in cuts if begin < cut < end)
+
+
+def chunk_transcript(parsed: ParsedTranscript, stories: List[Dict],
+                     max_tokens: int = DEFAULT_CHUNK_TOKENS,
+                     span: Optional[Tuple[int, int]] = None) -> List[TextChunk]:
+    """Split a transcript into chunks of at most max_tokens, aligned to stories.
+
+    stories are ContentStructureAnalyzer.identify_story_boundaries() results.
+    Whole stories are packed together while they fit; a story longer than the
+    budget is split at sentence ends. span limits chunking to a char range.
+    """
+    text = parsed.text
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    cue_offsets = np.asarray(parsed.segment_offsets, dtype=np.int64)
+    span_begin, span_end = span or (0, len(text))
+
+    # Story starts as char offsets; text before the first marker is the intro
+    story_offsets = (int(cue_offsets[story['start_index']]) for story in stories)
+    story_starts = sorted({span_begin, *(offset for offset in story_offsets if span_begin < offset < span_end)})
+    story_ends = story_starts[1:] + [span_end]
+
+    # Packable units: whole stories, or the pieces of an oversized story
+    units = []
+    for begin, end in zip(story_starts, story_ends):
+        cuts = [begin] + _split_span(text, begin, end, max_chars, cue_offsets) + [end]
+        units.extend(zip(cuts, cuts[1:]))
+
+    # Greedy packing; a chunk closes at whichever unit edge keeps it under budget
+    ranges = []
+    chunk_begin, chunk_end = units[0] if units else (0, 0)
+    for begin, end in units[1:]:
+        if end - chunk_begin > max_chars:
+            ranges.append((chunk_begin, chunk_end))
+            chunk_begin = begin
+        chunk_end = end
+    ranges.append((chunk_begin, chunk_end))
+
+    segment_starts = parsed.segment_starts
+    segment_ends = parsed.segment_ends
+    chunks = []
+    for begin, end in ranges:
+        chunk_text = text[begin:end].strip()
+        if not chunk_text:
+            continue
+        first = max(0, int(np.searchsorted(cue_offsets, begin, side='right')) - 1)
+        last = max(first, min(len(segment_ends) - 1, int(np.searchsorted(cue_offsets, end, side='left')) - 1))
+        start_time = float(segment_starts[first]) if len(segment_starts) else 0.0
+        end_time = float(segment_ends[last]) if len(segment_ends) else 0.0
+        chunks.append(TextChunk(chunk_text, start_time, end_time))
+    return chunks
+
+
+def chunk_input(chunk: TextChunk, number: int, total: int) -> str:
+    """Text sent to Fabric for one chunk (map step)."""
+    return (f"[Part {number} of {total} of a longer transcript, "
+            f"{_format_time(chunk.start_time)}-{_format_time(chunk.end_time)}]\n\n{chunk.text}")
+
+
+def reduce_input(chunks: List[TextChunk], outputs: List) -> str:
+    """Text sent to Fabric to merge per-chunk outputs into one analysis (reduce step)."""
+    parts = [
+        f"## Part {number} ({_format_time(chunk.start_time)}-{_format_time(chunk.end_time)})\n\n{output}"
+        for number, (chunk, output) in enumerate(zip(chunks, outputs), 1) if output
+    ]
+    return (f"The input below is {len(parts)} analyses produced by this pattern for consecutive parts "
+            "of one long transcript. Merge them into a single analysis of the whole transcript, "
+            "following the OUTPUT format exactly; do not describe the parts separately.\n\n"
+            + "\n\n".join(parts))
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Bounded-concurrency runner for Fabric pattern jobs.
+Runs one job per (transcript, pattern) on a thread pool; each video's result
+is handed back as soon as one of its jobs finishes, so results are written
+incrementally instead of after the whole corpus.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FabricTask(NamedTuple):
+    """One pattern run over a list of chunks; its output is stored in analysis[pattern_name]."""
+    analysis: Dict
+    pattern_name: str
+    chunks: List
+    label: str = ''
+
+
+class FabricEngine:
+    """Schedules Fabric calls for many transcripts concurrently."""
+
+    def __init__(self, analyzer, max_workers: int = 4, timeout: float = 120):
+        self.analyzer = analyzer
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+
+    @staticmethod
+    def _throughput(jobs_done: int, start_time: float) -> float:
+        """Jobs per minute since start_time."""
+        elapsed = time.monotonic() - start_time
+        return jobs_done / (elapsed / 60) if elapsed > 0 else 0.0
+
+    def run(self, transcripts: List[Tuple[str, Path]], metadata: Dict[str, Dict],
+            on_result: Callable[[Dict, bool], None]) -> Dict[str, Dict]:
+        """Analyze every transcript with every pattern; returns per-video results.
+
+        on_result(result, finished) is called after each task of a video
+        completes; finished is True once all of that video's tasks are done.
+        Transcripts are loaded only when their jobs are scheduled, so at most
+        a few transcripts are held in memory at once. A task with several
+        chunks runs one job per chunk (map) and a merge job once its chunks
+        are done (reduce), so its latency is bounded by the slowest chunk.
+        """
+        patterns = self.analyzer.patterns
+        total_jobs = len(transcripts) * len(patterns)  # Refined as transcripts are loaded
+        remaining = iter(transcripts)
+        # (task_id, chunk_index) ready to submit; chunk_index None merges the task's chunks
+        queued = deque()
+        tasks: Dict[int, Tuple[str, FabricTask, List[str]]] = {}  # task_id -> (video_id, task, inputs)
+        chunk_outputs: Dict[int, List[Optional[str]]] = {}
+        chunks_pending: Dict[int, int] = {}
+        pending: Dict[str, int] = {}  # Tasks still running or queued per video
+        results: Dict[str, Dict] = {}
+        futures = {}
+        jobs_done = 0
+        next_task_id = 0
+        start_time = time.monotonic()
+
+        def schedule_next_video() -> bool:
+            nonlocal total_jobs, next_task_id
+            for video_id, transcript_file in remaining:
+                total_jobs -= len(patterns)
+                result, video_tasks = self.analyzer.prepare_analysis(
+                    transcript_file, metadata.get(video_id, {}), video_id)
+                if not video_tasks:
+                    continue
+                results[video_id] = result
+                pending[video_id] = len(video_tasks)
+                for task in video_tasks:
+                    chunk_count = len(task.chunks)
+                    total_jobs += chunk_count + (1 if chunk_count > 1 else 0)
+                    tasks[next_task_id] = (video_id, task, self.analyzer.chunk_inputs(task.chunks))
+                    chunk_outputs[next_task_id] = [None] * chunk_count
+                    chunks_pending[next_task_id] = chunk_count
+                    queued.extend((next_task_id, index) for index in range(chunk_count))
+                    next_task_id += 1
+                return True
+            return False
+
+        def finish_task(task_id: int, output: Optional[str]):
+            video_id, task, _ = tasks.pop(task_id)
+            task.analysis[task.pattern_name] = output
+            label = f" ({task.label})" if task.label else ""
+            if output:
+                logger.info(f"    ✓ {video_id} {task.pattern_name}{label} completed")
+            else:
+                logger.warning(f"    ✗ {video_id} {task.pattern_name}{label} failed")
+
+            pending[video_id] -= 1
+            finished = pending[video_id] == 0
+            if finished:
+                del pending[video_id]
+            on_result(results[video_id], finished)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                # Fill free slots, loading the next transcript only when its jobs can start
+                while len(futures) < self.max_workers and (queued or schedule_next_video()):
+                    task_id, index = job = queued.popleft()
+                    video_id, task, inputs = tasks[task_id]
+                    pattern_id = patterns[task.pattern_name]
+                    if index is None:
+                        future = executor.submit(self.analyzer.merge_chunk_outputs, task.chunks,
+                                                 chunk_outputs.pop(task_id), pattern_id, self.timeout)
+                    else:
+                        future = executor.submit(self.analyzer.analyze_with_fabric,
+                                                 inputs[index], pattern_id, self.timeout)
+                    futures[future] = job
+
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_id, index = futures.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as e:
+                        video_id, task, _ = tasks[task_id]
+                        logger.error(f"Fabric job {task.pattern_name} failed for {video_id}: {e}")
+                        output = None
+
+                    if index is None:
+                        finish_task(task_id, output)
+                    else:
+                        chunk_outputs[task_id][index] = output
+                        chunks_pending[task_id] -= 1
+                        if chunks_pending[task_id] == 0:
+                            del chunks_pending[task_id]
+                            if len(chunk_outputs[task_id]) == 1:
+                                finish_task(task_id, chunk_outputs.pop(task_id)[0])
+                            else:
+                                # Merges go first so finished videos are written promptly
+                                queued.appendleft((task_id, None))
+
+                    jobs_done += 1
+                    logger.info(f"Fabric jobs {jobs_done}/{total_jobs} "
+                                f"({self._throughput(jobs_done, start_time):.1f} jobs/min)")
+
+        return results
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Offline yt-dlp stand-in for ingest benchmarks.
+Speaks the subset of the yt-dlp CLI used by content_analyzer.py and replays
+the research/transcripts and research/metadata fixtures instead of hitting YouTube.
+
+Environment:
+    FAKE_YTDLP_FIXTURES      research directory to replay (default: ../research)
+    FAKE_YTDLP_LATENCY       seconds to sleep per invocation (default: 0)
+    FAKE_YTDLP_ENTRY_LATENCY seconds to sleep per listed playlist entry (default: 0)
+    FAKE_YTDLP_REPEAT        replay each fixture video N times under distinct ids (default: 1)
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+VERSION = '2025.08.27-offline'
+
+# Replayed copies get ids like <fixture id>~<n>
+REPEAT_SEPARATOR = '~'
+
+
+def fixtures_dir() -> Path:
+    return Path(os.environ.get('FAKE_YTDLP_FIXTURES', Path(__file__).resolve().parent.parent / 'research'))
+
+
+def load_channels() -> Dict[str, List[Dict]]:
+    """Channel URL -> listing entries, newest first."""
+    with open(fixtures_dir() / 'analysis_summary.json', 'r') as f:
+        summary = json.load(f)
+
+    repeat = int(os.environ.get('FAKE_YTDLP_REPEAT', '1'))
+    channels = {}
+    for channel_data in summary.get('channels', {}).values():
+        entries = []
+        for copy in range(repeat):
+            for video in channel_data.get('videos', []):
+                video_id = video['id'] if copy == 0 else f"{video['id']}{REPEAT_SEPARATOR}{copy}"
+                entries.append({**video, 'id': video_id})
+        channels[channel_data['url'].rstrip('/')] = entries
+    return channels
+
+
+def fixture_id(video_id: str) -> str:
+    return video_id.split(REPEAT_SEPARATOR)[0]
+
+
+def render(template: str, fields: Dict) -> str:
+    """Minimal %(field)s output template rendering."""
+    return re.sub(r'%\((\w+)\)s', lambda m: str(fields.get(m.group(1), 'NA')), template)
+
+
+def video_id_from_url(url: str) -> str:
+    match = re.search(r'[?&]v=([^&]+)', url)
+    return match.group(1) if match else url.rstrip('/').rsplit('/', 1)[-1]
+
+
+def list_channel(args: argparse.Namespace) -> int:
+    channel_url = re.sub(r'/videos$', '', args.url.rstrip('/'))
+    entries = load_channels().get(channel_url)
+    if entries is None:
+        print(f"ERROR: Unable to recognize channel {args.url}", file=sys.stderr)
+        return 1
+
+    entry_latency = float(os.environ.get('FAKE_YTDLP_ENTRY_LATENCY', '0'))
+    limit = args.playlist_end or len(entries)
+    for entry in entries[:limit]:
+        time.sleep(entry_latency)
+        print(render(args.print, entry), flush=True)
+    return 0
+
+
+def fetch_video(args: argparse.Namespace) -> int:
+    video_id = video_id_from_url(args.url)
+    source_id = fixture_id(video_id)
+    fixtures = fixtures_dir()
+
+    metadata_file = fixtures / 'metadata' / f"{source_id}.json"
+    if not metadata_file.exists():
+        print(f"ERROR: [youtube] {video_id}: Video unavailable", file=sys.stderr)
+        return 1
+
+    simulate = args.dump_json and not args.no_simulate
+    if args.write_auto_subs and args.output and not simulate:
+        for lang in (args.sub_langs or 'en').split(','):
+            source = fixtures / 'transcripts' / f"{source_id}.{lang}.vtt"
+            if source.exists():
+                target = Path(args.output.replace('%(ext)s', f"{lang}.{args.sub_format or 'vtt'}"))
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source, target)
+
+    if args.dump_json:
+        with open(metadata_file, 'r') as f:
+            info = json.load(f)
+        info['id'] = video_id
+        info['webpage_url'] = args.url
+        print(json.dumps(info))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Offline yt-dlp stand-in')
+    parser.add_argument('--version', action='store_true')
+    parser.add_argument('--flat-playlist', action='store_true')
+    parser.add_argument('--lazy-playlist', action='store_true')
+    parser.add_argument('--print', default='%(id)s')
+    parser.add_argument('--playlist-end', type=int)
+    parser.add_argument('--write-auto-subs', action='store_true')
+    parser.add_argument('--sub-langs')
+    parser.add_argument('--sub-format')
+    parser.add_argument('--skip-download', action='store_true')
+    parser.add_argument('--dump-json', action='store_true')
+    parser.add_argument('--no-simulate', action='store_true')
+    parser.add_argument('--output')
+    parser.add_argument('url', nargs='?')
+
+    args = parser.parse_args(argv)
+
+    if args.version:
+        print(VERSION)
+        return 0
+
+    time.sleep(float(os.environ.get('FAKE_YTDLP_LATENCY', '0')))
+
+    if not args.url:
+        parser.error('missing URL')
+    if args.flat_playlist:
+        return list_channel(args)
+    return fetch_video(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
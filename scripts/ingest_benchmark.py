@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Ingest throughput benchmark against the offline yt-dlp stand-in.
+Runs YouTubeTranscriptAnalyzer.analyze_channels on a scratch directory for each
+concurrency setting and reports videos/second and peak RSS.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+FAKE_YTDLP = SCRIPTS_DIR / 'fake_ytdlp.py'
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process and its waited-for children, in MB."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes on Linux
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return max(own, children) / scale
+
+
+def run_single(fixtures: str, concurrency: int, per_channel: int) -> Dict:
+    """Run one ingest pass in this process and return its measurements."""
+    from content_analyzer import YouTubeTranscriptAnalyzer
+
+    with open(Path(fixtures) / 'analysis_summary.json', 'r') as f:
+        summary = json.load(f)
+
+    with tempfile.TemporaryDirectory(prefix='ingest-bench-') as work_dir:
+        config_file = Path(work_dir) / 'channels.json'
+        with open(config_file, 'w') as f:
+            json.dump({'channels': [
+                {'name': channel['name'], 'url': channel['url']}
+                for channel in summary.get('channels', {}).values()
+            ]}, f)
+
+        analyzer = YouTubeTranscriptAnalyzer(
+            str(Path(work_dir) / 'research'),
+            ytdlp_cmd=[sys.executable, str(FAKE_YTDLP)]
+        )
+
+        start = time.perf_counter()
+        results = analyzer.analyze_channels(str(config_file), min_views=0,
+                                            max_videos_per_channel=10000,
+                                            concurrency=concurrency,
+                                            per_channel=per_channel)
+        elapsed = time.perf_counter() - start
+
+    videos = results.get('successful_transcripts', 0)
+    return {
+        'concurrency': concurrency,
+        'per_channel': per_channel,
+        'videos': videos,
+        'seconds': round(elapsed, 2),
+        'videos_per_second': round(videos / elapsed, 2) if elapsed > 0 else 0.0,
+        'peak_rss_mb': round(peak_rss_mb(), 1)
+    }
+
+
+def run_isolated(fixtures: str, concurrency: int, per_channel: int, env: Dict) -> Dict:
+    """Run one configuration in a fresh interpreter so peak RSS is not shared."""
+    cmd = [
+        sys.executable, str(Path(__file__).resolve()), '--single',
+        '--fixtures', fixtures,
+        '--concurrency', str(concurrency),
+        '--per-channel', str(per_channel)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True, env=env)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline ingest throughput benchmark')
+    parser.add_argument('--fixtures', default=str(SCRIPTS_DIR.parent / 'research'),
+                       help='Research directory replayed by the stand-in')
+    parser.add_argument('--concurrency', default='1,4,8',
+                       help='Comma-separated global concurrency levels (default: 1,4,8)')
+    parser.add_argument('--per-channel', type=int, default=2,
+                       help='Per-channel concurrency limit (default: 2)')
+    parser.add_argument('--latency', type=float, default=0.2,
+                       help='Simulated seconds of network latency per yt-dlp call (default: 0.2)')
+    parser.add_argument('--repeat', type=int, default=1,
+                       help='Replay each fixture video N times (default: 1)')
+    parser.add_argument('--single', action='store_true',
+                       help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args.fixtures, int(args.concurrency), args.per_channel)))
+        return
+
+    env = {
+        **os.environ,
+        'FAKE_YTDLP_FIXTURES': args.fixtures,
+        'FAKE_YTDLP_LATENCY': str(args.latency),
+        'FAKE_YTDLP_REPEAT': str(args.repeat),
+    }
+
+    runs: List[Dict] = []
+    for concurrency in [int(level) for level in args.concurrency.split(',')]:
+        runs.append(run_isolated(args.fixtures, concurrency, args.per_channel, env))
+
+    print("\n📈 INGEST BENCHMARK (offline yt-dlp stand-in)")
+    print(f"{'Concurrency':<12} {'Videos':<8} {'Seconds':<9} {'Videos/s':<10} {'Peak RSS':<10}")
+    print("-" * 52)
+    for run in runs:
+        print(f"{run['concurrency']:<12} {run['videos']:<8} {run['seconds']:<9} "
+              f"{run['videos_per_second']:<10} {run['peak_rss_mb']} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Bounded-concurrency ingest engine for channel listing and transcript download.
+Runs yt-dlp jobs on a thread pool with a global limit and a per-channel limit.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class IngestEngine:
+    """Schedules channel listings and per-video downloads concurrently."""
+
+    def __init__(self, analyzer, max_workers: int = 8, per_channel: int = 2, store=None):
+        self.analyzer = analyzer
+        self.store = store  # Optional CorpusStore receiving incremental upserts
+        self.max_workers = max(1, max_workers)
+        self.per_channel = max(1, per_channel)
+
+    @staticmethod
+    def _throughput(videos_done: int, start_time: float) -> float:
+        """Videos per minute since start_time."""
+        elapsed = time.monotonic() - start_time
+        return videos_done / (elapsed / 60) if elapsed > 0 else 0.0
+
+    def _ingest_video(self, video: Dict) -> Dict:
+        """Download transcript and metadata for one video."""
+        result = self.analyzer.extract_transcript(video['url'], video['id'])
+        if not result:
+            return {}
+
+        transcript_file, metadata = result
+        clean_text = self.analyzer.clean_transcript(transcript_file)
+        return {
+            **video,
+            'metadata': metadata,
+            'transcript_length': len(clean_text),
+            'transcript_file': transcript_file
+        }
+
+    def run(self, channels: List[Dict], min_views: int = 100000,
+            max_videos_per_channel: int = 20, incremental: bool = False) -> Dict:
+        """Ingest all channels and return results in the analysis summary schema."""
+        analysis_results = {
+            'channels_analyzed': len(channels),
+            'total_videos': 0,
+            'successful_transcripts': 0,
+            'channels': {}
+        }
+
+        pending_videos = {}  # channel name -> list of (index, video) waiting to run
+        in_flight = {}  # channel name -> running video jobs
+        video_results = {}  # channel name -> {index: video_data}
+        futures = {}
+        videos_done = 0
+        start_time = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for channel in channels:
+                channel_name = channel.get('name', 'unknown')
+                channel_url = channel.get('url', '')
+
+                if not channel_url:
+                    logger.warning(f"No URL provided for channel: {channel_name}")
+                    continue
+
+                analysis_results['channels'][channel_name] = {
+                    'name': channel_name,
+                    'url': channel_url,
+                    'videos_found': 0,
+                    'transcripts_extracted': 0,
+                    'videos': []
+                }
+                pending_videos[channel_name] = []
+                in_flight[channel_name] = 0
+                video_results[channel_name] = {}
+
+                future = executor.submit(self.analyzer.extract_channel_videos,
+                                         channel_url, min_views, max_videos_per_channel, incremental)
+                futures[future] = ('listing', channel_name, None)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    kind, channel_name, index = futures.pop(future)
+                    channel_results = analysis_results['channels'][channel_name]
+
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Ingest job failed for {channel_name}: {e}")
+                        result = [] if kind == 'listing' else {}
+
+                    if kind == 'listing':
+                        channel_results['videos_found'] = len(result)
+                        analysis_results['total_videos'] += len(result)
+                        pending_videos[channel_name].extend(enumerate(result))
+                        if self.store:
+                            self.store.upsert_videos(channel_name, channel_results['url'], result)
+                        continue
+
+                    in_flight[channel_name] -= 1
+                    videos_done += 1
+                    if result:
+                        if self.store:
+                            self.store.upsert_video(channel_name, result, index)
+                        video_results[channel_name][index] = result
+                        channel_results['transcripts_extracted'] += 1
+                        analysis_results['successful_transcripts'] += 1
+
+                    logger.info(f"Ingested {videos_done}/{analysis_results['total_videos']} videos "
+                                f"({self._throughput(videos_done, start_time):.1f} videos/min)")
+
+                # Fill free slots round-robin across channels
+                scheduled = True
+                while scheduled and len(futures) < self.max_workers:
+                    scheduled = False
+                    for channel_name, queue in pending_videos.items():
+                        if len(futures) >= self.max_workers:
+                            break
+                        if queue and in_flight[channel_name] < self.per_channel:
+                            index, video = queue.pop(0)
+                            future = executor.submit(self._ingest_video, video)
+                            futures[future] = ('video', channel_name, index)
+                            in_flight[channel_name] += 1
+                            scheduled = True
+
+        # Keep each channel's videos in listing order
+        for channel_name, results_by_index in video_results.items():
+            analysis_results['channels'][channel_name]['videos'] = [
+                results_by_index[index] for index in sorted(results_by_index)
+            ]
+
+        elapsed = time.monotonic() - start_time
+        throughput = self._throughput(videos_done, start_time)
+        analysis_results['ingest_seconds'] = round(elapsed, 1)
+        analysis_results['videos_per_minute'] = round(throughput, 1)
+        logger.info(f"Ingested {videos_done} videos in {elapsed:.1f}s ({throughput:.1f} videos/min)")
+
+        return analysis_results
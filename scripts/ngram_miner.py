@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Streaming n-gram and hook-phrase mining over the transcript corpus.
+Every transcript is read once; approximate top-k n-gram counts are kept in
+bounded memory (space-saving heavy hitters, tightened with a count-min sketch)
+separately for story openings, story endings and the full text.
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+import logging
+
+import numpy as np
+
+from structure_analyzer import SEGMENTATION_MODES, ContentStructureAnalyzer
+from transcript_cache import ParsedTranscript
+from transcript_index import corpus_transcripts
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SCOPES = ('openings', 'endings', 'full_text')
+
+DEFAULT_NGRAM_SIZES = (2, 3, 4)
+DEFAULT_WINDOW_WORDS = 150  # Roughly the first/last minute of a story
+DEFAULT_CAPACITY = 5000  # Space-saving counters per scope and n-gram size
+DEFAULT_SKETCH_WIDTH = 1 << 18
+DEFAULT_SKETCH_DEPTH = 4
+
+# N-grams made only of these words are skipped ("of the", "and then i")
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have he her him his
+i i'm if in into is it it's its just me my no not of on or our out she so than that that's the
+their them then there they this to up was we were what when which who will with would you your
+""".split())
+
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def word_hashes(words: List[str]) -> np.ndarray:
+    """Stable 64-bit hash per word (Python's hash() is salted per process)."""
+    return np.array([int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+                     for word in words], dtype=np.uint64)
+
+
+def ngram_hashes(token_hashes: np.ndarray, n: int) -> np.ndarray:
+    """Hash of every n-gram in a token hash stream (wrapping uint64 polynomial)."""
+    count = len(token_hashes) - n + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(n):
+        hashes = hashes * _HASH_MULTIPLIER + token_hashes[offset:offset + count]
+    return hashes
+
+
+class SpaceSaving:
+    """Top-k heavy hitters with a fixed number of counters (weighted space-saving)."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.counts: Dict[int, int] = {}
+        self.errors: Dict[int, int] = {}
+        self.labels: Dict[int, str] = {}
+        self._heap: List[Tuple[int, int]] = []  # Lazy min-heap of (count, key)
+
+    def increment(self, key: int, weight: int) -> bool:
+        """Add to an existing counter; False if the key is not monitored."""
+        if key not in self.counts:
+            return False
+        self.counts[key] += weight
+        self._push(key)
+        return True
+
+    def update(self, key: int, weight: int, label: str):
+        if self.increment(key, weight):
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = weight
+            self.errors[key] = 0
+            self.labels[key] = label
+        else:
+            # Replace the smallest counter; its count bounds the newcomer's overestimate
+            while True:
+                count, evicted = heapq.heappop(self._heap)
+                if self.counts.get(evicted) == count:
+                    break
+            del self.counts[evicted], self.errors[evicted], self.labels[evicted]
+            self.counts[key] = count + weight
+            self.errors[key] = count
+            self.labels[key] = label
+        self._push(key)
+
+    def _push(self, key: int):
+        heapq.heappush(self._heap, (self.counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, key) for key, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def monitored_keys(self) -> np.ndarray:
+        return np.fromiter(self.counts, dtype=np.uint64, count=len(self.counts))
+
+    def min_count(self) -> int:
+        """Smallest counter once all counters are in use, else 0."""
+        if len(self.counts) < self.capacity:
+            return 0
+        while self.counts.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0]
+
+    def top(self, k: int) -> List[Tuple[int, int, str, int]]:
+        """(key, count, label, error) of the k largest counters."""
+        keys = heapq.nlargest(k, self.counts, key=self.counts.get)
+        return [(key, self.counts[key], self.labels[key], self.errors[key]) for key in keys]
+
+
+class CountMinSketch:
+    """Fixed-size frequency sketch; estimates never undercount."""
+
+    def __init__(self, width: int = DEFAULT_SKETCH_WIDTH, depth: int = DEFAULT_SKETCH_DEPTH, seed: int = 17):
+        self.width_bits = max(1, int(width - 1).bit_length())
+        self.table = np.zeros((depth, 1 << self.width_bits), dtype=np.uint32)
+        rng = np.random.default_rng(seed)
+        self.multipliers = rng.integers(1, np.iinfo(np.int64).max, size=depth, dtype=np.uint64) | np.uint64(1)
+
+    def _columns(self, keys: np.ndarray) -> np.ndarray:
+        # Multiply-shift hashing, one row per multiplier
+        return (keys[None, :] * self.multipliers[:, None]) >> np.uint64(64 - self.width_bits)
+
+    def add(self, keys: np.ndarray, counts: np.ndarray):
+        for row, columns in enumerate(self._columns(keys)):
+            np.add.at(self.table[row], columns.astype(np.intp), counts.astype(np.uint32))
+
+    def estimate(self, keys: np.ndarray) -> np.ndarray:
+        columns = self._columns(keys).astype(np.intp)
+        return self.table[np.arange(len(self.table))[:, None], columns].min(axis=0)
+
+
+class NgramMiner:
+    """Streams transcripts into per-scope n-gram frequency summaries."""
+
+    def __init__(self, research_dir: str = "research", ngram_sizes=DEFAULT_NGRAM_SIZES,
+                 window_words: int = DEFAULT_WINDOW_WORDS, capacity: int = DEFAULT_CAPACITY,
+                 keep_stopwords: bool = False, segmentation: str = 'hybrid'):
+        self.research_dir = Path(research_dir)
+        self.segmentation = segmentation
+        self.structure_analyzer = ContentStructureAnalyzer(research_dir, segmentation=segmentation)
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.window_words = window_words
+        self.keep_stopwords = keep_stopwords
+
+        self.heavy_hitters = {(scope, n): SpaceSaving(capacity) for scope in SCOPES for n in self.ngram_sizes}
+        self.sketches = {scope: CountMinSketch() for scope in SCOPES}
+        self.videos_processed = 0
+        self.spans_processed = 0
+
+    def story_spans(self, parsed: ParsedTranscript) -> List[Tuple[int, int]]:
+        """Word ranges [begin, end) of the intro and each story."""
+        stories = self.structure_analyzer.identify_story_boundaries(parsed)
+        word_offsets = parsed.segment_word_offsets
+        spans = [(int(word_offsets[story['start_index']]), int(word_offsets[story['end_index'] + 1]))
+                 for story in stories]
+        first_story = spans[0][0] if spans else parsed.word_count
+        if first_story > 0:
+            # Everything before the first marker is the video's own opening
+            spans.insert(0, (0, first_story))
+        return [(begin, end) for begin, end in spans if end > begin]
+
+    def add_transcript(self, parsed: ParsedTranscript):
+        """Count one transcript's n-grams in every scope."""
+        word_timings = parsed.word_timings
+        words = word_timings.vocabulary.words
+        token_ids = np.asarray(word_timings.token_ids, dtype=np.intp)
+        if not len(token_ids):
+            return
+
+        token_hashes = word_hashes(words)[token_ids]
+        stop = np.array([word in STOPWORDS for word in words], dtype=bool)[token_ids]
+        # Tokens without letters or digits (the "[ __ ]" profanity mask) break n-grams
+        breaks = np.array([not any(c.isalnum() for c in word) for word in words], dtype=bool)[token_ids]
+
+        spans = self.story_spans(parsed)
+        window = self.window_words
+        ranges = {
+            'openings': [(begin, min(end, begin + window)) for begin, end in spans],
+            'endings': [(max(begin, end - window), end) for begin, end in spans],
+            'full_text': [(0, len(token_ids))],
+        }
+
+        for scope, scope_ranges in ranges.items():
+            for n in self.ngram_sizes:
+                self._count(scope, n, scope_ranges, token_ids, token_hashes, stop, breaks, words)
+
+        self.videos_processed += 1
+        self.spans_processed += len(spans)
+
+    def _count(self, scope: str, n: int, ranges: List[Tuple[int, int]], token_ids: np.ndarray,
+               token_hashes: np.ndarray, stop: np.ndarray, breaks: np.ndarray, words: List[str]):
+        keys = []
+        starts = []
+        for begin, end in ranges:
+            hashes = ngram_hashes(token_hashes[begin:end], n)
+            positions = np.arange(begin, begin + len(hashes))
+            if len(hashes):
+                window = np.ones(n, dtype=np.int32)
+                keep = np.convolve(breaks[begin:end].astype(np.int32), window, 'valid') == 0
+                if not self.keep_stopwords:
+                    keep &= np.convolve(stop[begin:end].astype(np.int32), window, 'valid') < n
+                hashes, positions = hashes[keep], positions[keep]
+            keys.append(hashes)
+            starts.append(positions)
+        if not keys:
+            return
+
+        keys = np.concatenate(keys)
+        starts = np.concatenate(starts)
+        if not len(keys):
+            return
+
+        # Aggregate within the transcript first, then feed weighted updates
+        unique_keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+        sketch = self.sketches[scope]
+        sketch.add(unique_keys, counts)
+        heavy_hitters = self.heavy_hitters[(scope, n)]
+
+        monitored = np.isin(unique_keys, heavy_hitters.monitored_keys())
+        for key, count in zip(unique_keys[monitored].tolist(), counts[monitored].tolist()):
+            heavy_hitters.increment(key, count)
+
+        # Keys whose sketch estimate cannot beat the smallest counter would only churn the summary
+        candidates = ~monitored & (sketch.estimate(unique_keys) > heavy_hitters.min_count())
+        for key, position, count in zip(unique_keys[candidates].tolist(), starts[first[candidates]].tolist(),
+                                        counts[candidates].tolist()):
+            heavy_hitters.update(key, count, ' '.join(words[t] for t in token_ids[position:position + n]))
+
+    def top_ngrams(self, top_k: int = 25) -> Dict:
+        """Top n-grams per scope and size, with count-min tightened counts."""
+        results = {}
+        for scope in SCOPES:
+            results[scope] = {}
+            for n in self.ngram_sizes:
+                top = self.heavy_hitters[(scope, n)].top(top_k * 2)
+                if not top:
+                    results[scope][f"{n}-grams"] = []
+                    continue
+                estimates = self.sketches[scope].estimate(np.array([key for key, *_ in top], dtype=np.uint64))
+                rows = [{
+                    'ngram': label,
+                    'count': int(min(count, estimate)),
+                    'min_count': int(count - error)
+                } for (key, count, label, error), estimate in zip(top, estimates.tolist())]
+                rows.sort(key=lambda row: (-row['count'], row['ngram']))
+                results[scope][f"{n}-grams"] = rows[:top_k]
+        return results
+
+    def mine_corpus(self, top_k: int = 25) -> Dict:
+        """Stream every transcript once and return the frequency report."""
+        transcripts = corpus_transcripts(self.research_dir)
+        logger.info(f"Mining n-grams from {len(transcripts)} transcripts")
+
+        for video_id, transcript_file in transcripts:
+            try:
+                parsed = self.structure_analyzer.transcript_cache.load(transcript_file)
+            except Exception as e:
+                logger.error(f"Error loading transcript {transcript_file}: {e}")
+                continue
+            self.add_transcript(parsed)
+
+        return {
+            'mining_date': datetime.now().isoformat(),
+            'videos_processed': self.videos_processed,
+            'spans_processed': self.spans_processed,
+            'window_words': self.window_words,
+            'segmentation': self.segmentation,
+            'ngrams': self.top_ngrams(top_k)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mine hook phrases and n-grams from transcripts')
+    parser.add_argument('--research-dir', default='research',
+                       help='Research directory (default: research)')
+    parser.add_argument('--sizes', default='2,3,4',
+                       help='Comma-separated n-gram sizes (default: 2,3,4)')
+    parser.add_argument('--window-words', type=int, default=DEFAULT_WINDOW_WORDS,
+                       help=f'Words counted at each story opening/ending (default: {DEFAULT_WINDOW_WORDS})')
+    parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY,
+                       help=f'Counters kept per scope and n-gram size (default: {DEFAULT_CAPACITY})')
+    parser.add_argument('--top', type=int, default=25,
+                       help='N-grams reported per scope and size (default: 25)')
+    parser.add_argument('--keep-stopwords', action='store_true',
+                       help='Also count n-grams made only of stopwords')
+    parser.add_argument('--segmentation', choices=SEGMENTATION_MODES, default='hybrid',
+                       help='Story boundary detection for openings/endings (default: hybrid)')
+
+    args = parser.parse_args()
+
+    miner = NgramMiner(args.research_dir, [int(n) for n in args.sizes.split(',')],
+                       args.window_words, args.capacity, args.keep_stopwords, args.segmentation)
+    report = miner.mine_corpus(args.top)
+
+    output_file = Path(args.research_dir) / 'structure_analysis' / 'ngram_frequencies.json'
+    with open(output_file, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n🔤 N-GRAM MINING ({report['videos_processed']} videos, {report['spans_processed']} stories)")
+    for scope, by_size in report['ngrams'].items():
+        print(f"\n{scope.replace('_', ' ').title()}:")
+        for size, rows in by_size.items():
+            top = ', '.join(f"\"{row['ngram']}\" ({row['count']})" for row in rows[:5])
+            print(f"  {size}: {top}")
+    print(f"\nReport saved to: {output_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Narration pacing curves from caption word timings.
+Each video gets windowed words-per-minute and pause-density timelines as
+float32 arrays; channel distributions of those curves are summarized and used
+to derive story length targets for the story generator.
+"""
+
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+import logging
+
+import numpy as np
+
+from corpus_store import CorpusStore
+from story_generator import HorrorStoryGenerator
+from transcript_cache import TranscriptCache
+from transcript_index import corpus_transcripts
+from word_timings import find_pauses
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_SECONDS = 60.0
+DEFAULT_STEP_SECONDS = 10.0
+PAUSE_SECONDS = 1.5  # Gap between words that counts as a pause
+
+# Windows slower than this are intros, music or silence rather than narration
+NARRATION_MIN_WPM = 60.0
+
+PERCENTILES = (10, 25, 50, 75, 90)
+UNASSIGNED_CHANNEL = 'unassigned'
+
+
+class PacingCurve(NamedTuple):
+    """Pacing timelines sampled every step seconds."""
+    times: np.ndarray  # float32 window centers (seconds)
+    wpm: np.ndarray  # float32 words per minute in the window
+    pause_density: np.ndarray  # float32 pauses per minute in the window
+
+
+def pacing_curve(word_starts: np.ndarray, window_seconds: float = DEFAULT_WINDOW_SECONDS,
+                 step_seconds: float = DEFAULT_STEP_SECONDS,
+                 pause_seconds: float = PAUSE_SECONDS) -> PacingCurve:
+    """Sliding-window speaking rate and pause density of one video."""
+    starts = np.asarray(word_starts, dtype=np.float64)
+    if len(starts) < 2:
+        empty = np.empty(0, dtype=np.float32)
+        return PacingCurve(empty, empty, empty)
+
+    half = window_seconds / 2
+    last_center = max(starts[0] + half, starts[-1] - half)
+    centers = np.arange(starts[0] + half, last_center + step_seconds / 2, step_seconds)
+
+    # Words and pauses inside each window, counted with two binary searches per array
+    words = np.searchsorted(starts, centers + half) - np.searchsorted(starts, centers - half)
+    pause_times = starts[find_pauses(starts, pause_seconds)]
+    pauses = np.searchsorted(pause_times, centers + half) - np.searchsorted(pause_times, centers - half)
+
+    per_minute = 60.0 / window_seconds
+    return PacingCurve(
+        centers.astype(np.float32),
+        (words * per_minute).astype(np.float32),
+        (pauses * per_minute).astype(np.float32)
+    )
+
+
+def distribution(values: np.ndarray) -> Dict:
+    """Percentile summary of a sample."""
+    if not len(values):
+        return {'count': 0}
+    points = np.percentile(values, PERCENTILES)
+    summary = {'count': int(len(values)), 'mean': round(float(np.mean(values)), 1)}
+    summary.update({f"p{p}": round(float(v), 1) for p, v in zip(PERCENTILES, points)})
+    return summary
+
+
+def story_targets(narration_wpm: Dict, time_ranges: List[str]) -> Dict:
+    """Word counts that fill each generator time range at the measured narration rate."""
+    wpm = narration_wpm['p50']
+    word_lengths = []
+    for time_range in time_ranges:
+        low, high = (float(minutes) for minutes in time_range.split('-'))
+        # Round to the nearest 50 words like the hand-picked targets
+        word_lengths.append(str(int(round((low + high) / 2 * wpm / 50) * 50)))
+    return {
+        'words_per_minute': wpm,
+        'time_ranges': list(time_ranges),
+        'word_lengths': word_lengths
+    }
+
+
+class PacingAnalyzer:
+    """Computes pacing curves for the whole corpus."""
+
+    def __init__(self, research_dir: str = "research", window_seconds: float = DEFAULT_WINDOW_SECONDS,
+                 step_seconds: float = DEFAULT_STEP_SECONDS):
+        self.research_dir = Path(research_dir)
+        self.output_dir = self.research_dir / "structure_analysis"
+        self.output_dir.mkdir(exist_ok=True)
+        self.transcript_cache = TranscriptCache(self.research_dir / ".cache" / "transcripts")
+        self.corpus_store = CorpusStore.open(self.research_dir)
+        self.window_seconds = window_seconds
+        self.step_seconds = step_seconds
+
+    def video_channels(self) -> Dict[str, str]:
+        return {
+            video['id']: channel_name
+            for channel_name in self.corpus_store.channel_names()
+            for video in self.corpus_store.channel_videos(channel_name)
+        }
+
+    def compute_curves(self) -> Dict[str, PacingCurve]:
+        """Pacing curve of every transcript in the corpus."""
+        curves = {}
+        for video_id, transcript_file in corpus_transcripts(self.research_dir):
+            try:
+                parsed = self.transcript_cache.load(transcript_file)
+            except Exception as e:
+                logger.error(f"Error loading transcript {transcript_file}: {e}")
+                continue
+            curves[video_id] = pacing_curve(parsed.word_timings.starts, self.window_seconds, self.step_seconds)
+        return curves
+
+    def save_curves(self, curves: Dict[str, PacingCurve]) -> Path:
+        """Store all curves as concatenated float32 arrays with per-video offsets."""
+        video_ids = sorted(curves)
+        offsets = np.zeros(len(video_ids) + 1, dtype=np.uint32)
+        offsets[1:] = np.cumsum([len(curves[video_id].times) for video_id in video_ids])
+
+        def concat(field: str) -> np.ndarray:
+            arrays = [getattr(curves[video_id], field) for video_id in video_ids]
+            return np.concatenate(arrays) if arrays else np.empty(0, dtype=np.float32)
+
+        curves_file = self.output_dir / "pacing_curves.npz"
+        np.savez(curves_file, video_ids=np.array(video_ids), offsets=offsets,
+                 times=concat('times'), wpm=concat('wpm'), pause_density=concat('pause_density'))
+        return curves_file
+
+    def summarize(self, curves: Dict[str, PacingCurve]) -> Dict:
+        """Per-channel and corpus-wide pacing distributions plus generator targets."""
+        channels = self.video_channels()
+        by_channel: Dict[str, List[PacingCurve]] = {}
+        for video_id, curve in curves.items():
+            by_channel.setdefault(channels.get(video_id, UNASSIGNED_CHANNEL), []).append(curve)
+
+        def summarize_curves(channel_curves: List[PacingCurve]) -> Dict:
+            wpm = np.concatenate([curve.wpm for curve in channel_curves])
+            pause_density = np.concatenate([curve.pause_density for curve in channel_curves])
+            narration = wpm >= NARRATION_MIN_WPM
+            return {
+                'videos': len(channel_curves),
+                'narration_share': round(float(np.mean(narration)), 3) if len(wpm) else 0.0,
+                'narration_wpm': distribution(wpm[narration]),
+                'pauses_per_minute': distribution(pause_density[narration]),
+                'video_median_wpm': distribution(np.array([
+                    np.median(curve.wpm[curve.wpm >= NARRATION_MIN_WPM])
+                    for curve in channel_curves if np.any(curve.wpm >= NARRATION_MIN_WPM)
+                ]))
+            }
+
+        all_curves = [curve for channel_curves in by_channel.values() for curve in channel_curves]
+        corpus = summarize_curves(all_curves) if all_curves else {'videos': 0}
+        summary = {
+            'analysis_date': datetime.now().isoformat(),
+            'window_seconds': self.window_seconds,
+            'step_seconds': self.step_seconds,
+            'corpus': corpus,
+            'channels': {name: summarize_curves(channel_curves)
+                         for name, channel_curves in sorted(by_channel.items())}
+        }
+        if corpus.get('narration_wpm', {}).get('count'):
+            summary['generator_targets'] = story_targets(corpus['narration_wpm'],
+                                                         HorrorStoryGenerator().time_ranges)
+        return summary
+
+    def run(self) -> Dict:
+        curves = self.compute_curves()
+        curves_file = self.save_curves(curves)
+        summary = self.summarize(curves)
+
+        summary_file = self.output_dir / "pacing_summary.json"
+        with open(summary_file, 'w') as f:
+            json.dump(summary, f, indent=2)
+        logger.info(f"Pacing curves saved to {curves_file}, summary to {summary_file}")
+        return summary
+
+
+def load_curve(curves_file: Path, video_id: str) -> PacingCurve:
+    """Read one video's curve back from pacing_curves.npz."""
+    data = np.load(curves_file)
+    index = int(np.flatnonzero(data['video_ids'] == video_id)[0])
+    begin, end = data['offsets'][index], data['offsets'][index + 1]
+    return PacingCurve(data['times'][begin:end], data['wpm'][begin:end], data['pause_density'][begin:end])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Narration pacing curves and generator targets')
+    parser.add_argument('--research-dir', default='research',
+                       help='Research directory (default: research)')
+    parser.add_argument('--window', type=float, default=DEFAULT_WINDOW_SECONDS,
+                       help=f'Window length in seconds (default: {DEFAULT_WINDOW_SECONDS:g})')
+    parser.add_argument('--step', type=float, default=DEFAULT_STEP_SECONDS,
+                       help=f'Window step in seconds (default: {DEFAULT_STEP_SECONDS:g})')
+
+    args = parser.parse_args()
+
+    summary = PacingAnalyzer(args.research_dir, args.window, args.step).run()
+
+    print(f"\n⏱️  PACING ANALYSIS ({summary['corpus'].get('videos', 0)} videos)")
+    for name, channel in summary['channels'].items():
+        wpm = channel['narration_wpm']
+        if wpm.get('count'):
+            print(f"  {name}: {wpm['p25']}-{wpm['p75']} WPM (median {wpm['p50']}), "
+                  f"{channel['pauses_per_minute']['p50']} pauses/min")
+    targets = summary.get('generator_targets')
+    if targets:
+        print(f"\nGenerator targets at {targets['words_per_minute']} WPM:")
+        for time_range, words in zip(targets['time_ranges'], targets['word_lengths']):
+            print(f"  {time_range} minutes -> {words} words")
+
+
+if __name__ == '__main__':
+    main()
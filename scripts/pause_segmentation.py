@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Timing-gap based story segmentation.
+Finds statistically long pauses between words with a rolling median/MAD over
+inter-word gaps, in one vectorized pass per transcript.
+"""
+
+from typing import Dict, NamedTuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# MAD -> standard deviation for normally distributed gaps
+MAD_SCALE = 1.4826
+
+DEFAULT_PAUSE_PARAMS = {
+    'window_words': 101,  # Rolling window (in gaps) for the local median/MAD
+    'robust_z': 10.0,  # Gap must exceed median by this many scaled MADs
+    'min_gap_seconds': 5.0,  # ...and be at least this long in absolute terms
+    'min_story_seconds': 180.0,  # Minimum spacing between pause boundaries
+    'merge_seconds': 30.0,  # Pause boundaries this close to a phrase boundary are dropped
+}
+
+
+class PauseBoundaries(NamedTuple):
+    """Pause boundaries as parallel arrays."""
+    word_indices: np.ndarray  # Index of the first word after each pause
+    times: np.ndarray  # Start time of that word (seconds)
+    gaps: np.ndarray  # Pause length (seconds)
+
+
+def rolling_median_mad(values: np.ndarray, window: int):
+    """Centered rolling median and median absolute deviation (edges padded)."""
+    window = max(1, min(window, len(values)))
+    half = window // 2
+    padded = np.pad(values, (half, window - 1 - half), mode='edge')
+    windows = sliding_window_view(padded, window)
+    median = np.median(windows, axis=1)
+    mad = np.median(np.abs(windows - median[:, None]), axis=1)
+    return median, mad
+
+
+def detect_pauses(word_starts: np.ndarray, params: Dict = None) -> PauseBoundaries:
+    """Find pauses that are long relative to the local speaking rhythm."""
+    params = {**DEFAULT_PAUSE_PARAMS, **(params or {})}
+    starts = np.asarray(word_starts, dtype=np.float64)
+    empty = PauseBoundaries(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+    if len(starts) < 3:
+        return empty
+
+    gaps = np.diff(starts)
+    median, mad = rolling_median_mad(gaps, params['window_words'])
+    robust_z = (gaps - median) / (MAD_SCALE * mad + 1e-6)
+
+    candidates = np.flatnonzero((robust_z >= params['robust_z']) & (gaps >= params['min_gap_seconds']))
+    if not len(candidates):
+        return empty
+
+    # Enforce minimum story length: keep the longest pauses first. The start of
+    # the transcript opens story 1, so it counts as an already-kept boundary
+    kept = []
+    kept_times = np.zeros(1)
+    for gap_index in candidates[np.argsort(-gaps[candidates], kind='stable')]:
+        time = starts[gap_index + 1]
+        if np.min(np.abs(kept_times - time)) < params['min_story_seconds']:
+            continue
+        kept.append(gap_index)
+        kept_times = np.append(kept_times, time)
+
+    kept = np.sort(np.asarray(kept, dtype=np.int64))
+    return PauseBoundaries(kept + 1, starts[kept + 1], gaps[kept])
+
+
+def pause_segment_indices(pauses: PauseBoundaries, segment_starts: np.ndarray) -> np.ndarray:
+    """Map pause boundaries to the segment containing the first word after each pause."""
+    indices = np.searchsorted(np.asarray(segment_starts, dtype=np.float64), pauses.times, side='right') - 1
+    return np.clip(indices, 0, max(len(segment_starts) - 1, 0))
+
+
+def drop_near(times: np.ndarray, reference_times: np.ndarray, seconds: float) -> np.ndarray:
+    """Boolean mask of times that are at least `seconds` away from every reference time."""
+    if not len(reference_times) or not len(times):
+        return np.ones(len(times), dtype=bool)
+    reference = np.sort(np.asarray(reference_times, dtype=np.float64))
+    position = np.searchsorted(reference, times)
+    before = reference[np.clip(position - 1, 0, len(reference) - 1)]
+    after = reference[np.clip(position, 0, len(reference) - 1)]
+    distance = np.minimum(np.abs(times - before), np.abs(after - times))
+    return distance >= seconds
@@ -13,7 +13,7 @@ import time
 from datetime import datetime
 
 class HorrorStoryGenerator:
-    def __init__(self):
+    def __init__(self, pacing_targets_file=None):
         # Random story component lists for infinite variety
         self.jobs = [
             "night security guard", "overnight stocker", "night desk clerk", "graveyard shift dispatcher",
@@ -62,6 +62,16 @@ class HorrorStoryGenerator:
         
         self.word_lengths = ["1300", "1350", "1400", "1450", "1500", "1550"]
         self.time_ranges = ["9-11", "10-12", "11-13", "10-11", "11-12", "12-14"]
+        self.paired_targets = False
+        
+        # Measured narration pacing (scripts/pacing.py) replaces the hand-picked word targets
+        if pacing_targets_file and os.path.exists(pacing_targets_file):
+            with open(pacing_targets_file, 'r') as f:
+                targets = json.load(f).get('generator_targets')
+            if targets:
+                self.word_lengths = targets['word_lengths']
+                self.time_ranges = targets['time_ranges']
+                self.paired_targets = True
     
     def create_prompt(self, setting):
         """Create the horror story prompt with specific setting variables"""
@@ -104,13 +114,18 @@ Generate the complete story now."""
     
     def generate_random_setting(self):
         """Generate completely random story setting for infinite variety"""
+        if self.paired_targets:
+            # Derived word lengths fit their time range, so pick them together
+            length, minutes = random.choice(list(zip(self.word_lengths, self.time_ranges)))
+        else:
+            length, minutes = random.choice(self.word_lengths), random.choice(self.time_ranges)
         return {
             "job": random.choice(self.jobs),
             "place": random.choice(self.places),
             "time_period": random.choice(self.time_periods),
             "element": random.choice(self.elements),
-            "length": random.choice(self.word_lengths),
-            "minutes": random.choice(self.time_ranges)
+            "length": length,
+            "minutes": minutes
         }
     
     def generate_story(self, setting, story_num):
@@ -274,8 +289,11 @@ def main():
         print(f"❌ Error checking Claude Code CLI: {str(e)}")
         return
     
-    # Create generator
-    generator = HorrorStoryGenerator()
+    # Create generator (word targets come from measured pacing when available)
+    pacing_targets_file = "research/structure_analysis/pacing_summary.json"
+    generator = HorrorStoryGenerator(pacing_targets_file)
+    if generator.paired_targets:
+        print(f"📏 Using measured pacing targets from {pacing_targets_file}")
     
     # Generate compilation
     try:
@@ -4,31 +4,63 @@ Phase 0B: Content Structure Analysis
 Analyzes transcript structure to identify story boundaries, transitions, and engagement patterns.
 """
 
+import argparse
+import hashlib
 import json
-import re
 import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import logging
 
+import numpy as np
+
+from accumulators import AccumulatorSet, load_partials, parse_shard, shard_of, write_partial
+from boundary_scanner import BoundaryScanner
+from corpus_store import CorpusStore
+from pause_segmentation import DEFAULT_PAUSE_PARAMS, detect_pauses, drop_near, pause_segment_indices
+from transcript_cache import ParsedTranscript, TranscriptCache, file_hash
+from transcript_store import TranscriptStore
+from vtt_parser import DEDUP_WINDOW, parse_timestamp
+from word_timings import find_pauses, words_per_minute
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SEGMENTATION_MODES = ('phrases', 'pauses', 'hybrid')
+
+# Bump when analyze_video_structure output changes (invalidates cached structure results)
+ANALYZER_VERSION = 3
+
+# File name prefix of sharded run_corpus_analysis partials
+PARTIAL_PREFIX = 'structure'
+
 class ContentStructureAnalyzer:
     """Analyzes horror video content structure from transcripts."""
     
-    def __init__(self, research_dir: str = "research"):
+    def __init__(self, research_dir: str = "research", segmentation: str = "phrases",
+                 pause_params: Optional[Dict] = None):
         self.research_dir = Path(research_dir)
         self.transcripts_dir = self.research_dir / "transcripts"
         self.metadata_dir = self.research_dir / "metadata"
         self.output_dir = self.research_dir / "structure_analysis"
+        self.partials_dir = self.output_dir / "partials"
         
         # Create output directory
         self.output_dir.mkdir(exist_ok=True)
         
-        # Load analysis summary for video metadata
-        self.video_data = self._load_video_metadata()
+        # Parsed transcripts and per-video structure results are cached across runs
+        self.transcript_cache = TranscriptCache(self.research_dir / ".cache" / "transcripts")
+        self.analysis_cache_dir = self.research_dir / ".cache" / "structure"
+        self.analysis_cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # One canonical transcript per video
+        self.transcript_store = TranscriptStore(self.research_dir)
+        
+        # Research corpus store for video metadata
+        self.corpus_store = CorpusStore.open(self.research_dir)
         
         # Story boundary markers (common patterns in horror transcripts)
         self.story_markers = [
@@ -60,59 +92,19 @@ class ContentStructureAnalyzer:
             r'here[\']?s\s+(?:another|the\s+next)',
         ]
         
-        # Compiled regex patterns
-        self.story_pattern = re.compile('|'.join(self.story_markers), re.IGNORECASE)
+        # Single-pass scanner over the continuous word stream
+        self.boundary_scanner = BoundaryScanner(self.story_markers)
         
-    def _load_video_metadata(self) -> Dict:
-        """Load video metadata from analysis summary."""
-        try:
-            summary_file = self.research_dir / 'analysis_summary.json'
-            with open(summary_file, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logger.warning("Analysis summary not found")
-            return {}
-    
-    def clean_vtt_transcript(self, vtt_file: str) -> str:
+        # Boundary sources: 'phrases' (story markers), 'pauses' (timing gaps) or 'hybrid'
+        if segmentation not in SEGMENTATION_MODES:
+            raise ValueError(f"Unknown segmentation mode: {segmentation}")
+        self.segmentation = segmentation
+        self.pause_params = {**DEFAULT_PAUSE_PARAMS, **(pause_params or {})}
+        
+    def clean_vtt_transcript(self, vtt_file: str) -> List[Dict]:
         """Clean VTT transcript file to plain text with timestamps."""
         try:
-            with open(vtt_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            lines = content.split('\n')
-            text_segments = []
-            current_time = None
-            
-            for line in lines:
-                line = line.strip()
-                
-                # Skip VTT headers and empty lines
-                if (not line or 
-                    line.startswith('WEBVTT') or
-                    line.startswith('NOTE') or
-                    line.isdigit()):
-                    continue
-                
-                # Extract timestamp
-                if '-->' in line:
-                    # Format: 00:00:15.120 --> 00:00:18.040
-                    start_time = line.split(' --> ')[0]
-                    current_time = self._parse_timestamp(start_time)
-                    continue
-                
-                # Clean text content
-                if line and current_time is not None:
-                    # Remove HTML tags and clean text
-                    clean_line = re.sub(r'<[^>]+>', '', line)
-                    clean_line = clean_line.strip()
-                    
-                    if clean_line:
-                        text_segments.append({
-                            'timestamp_seconds': current_time,
-                            'text': clean_line
-                        })
-            
-            return text_segments
+            return self.transcript_cache.load(vtt_file).segments()
             
         except Exception as e:
             logger.error(f"Error cleaning transcript {vtt_file}: {e}")
@@ -120,68 +112,80 @@ class ContentStructureAnalyzer:
     
     def _parse_timestamp(self, timestamp_str: str) -> int:
         """Parse VTT timestamp to seconds."""
-        try:
-            # Format: 00:00:15.120
-            time_parts = timestamp_str.split(':')
-            hours = int(time_parts[0])
-            minutes = int(time_parts[1])
-            seconds = float(time_parts[2])
-            
-            return int(hours * 3600 + minutes * 60 + seconds)
-        except:
-            return 0
+        return int(parse_timestamp(timestamp_str))
     
-    def identify_story_boundaries(self, text_segments: List[Dict]) -> List[Dict]:
-        """Identify story boundaries within transcript segments."""
-        stories = []
-        current_story = None
-        story_count = 0
+    def identify_story_boundaries(self, parsed: ParsedTranscript) -> List[Dict]:
+        """Identify story boundaries within a parsed transcript.
+        
+        Stories are (start_index, end_index) ranges over the transcript's
+        segments (inclusive). Segment text is sliced lazily from parsed.text.
+        """
+        if not len(parsed):
+            return []
+        
+        # Whole seconds, as in ParsedTranscript.segments()
+        timestamps = parsed.segment_starts.astype(np.int64)
+        
+        # First boundary per segment: (type, matched text, char offset)
+        boundary_hits = {}
+        
+        if self.segmentation in ('phrases', 'hybrid'):
+            # Markers may span a segment split
+            segments = ((int(timestamp), parsed.segment_text(index)) for index, timestamp in enumerate(timestamps))
+            for hit in self.boundary_scanner.scan(segments):
+                boundary_hits.setdefault(hit.segment_index, ('phrase', hit.text, hit.char_offset))
         
-        for i, segment in enumerate(text_segments):
-            text = segment['text'].lower()
+        if self.segmentation in ('pauses', 'hybrid'):
+            pauses = detect_pauses(parsed.word_timings.starts, self.pause_params)
+            phrase_times = timestamps[sorted(boundary_hits)].astype(np.float64)
+            keep = drop_near(pauses.times, phrase_times, self.pause_params['merge_seconds'])
             
-            # Check for story boundary markers
-            if self.story_pattern.search(text):
-                # End current story if exists
-                if current_story:
-                    current_story['end_time'] = segment['timestamp_seconds']
-                    current_story['end_index'] = i - 1
-                    stories.append(current_story)
-                
-                # Start new story
-                story_count += 1
-                current_story = {
-                    'story_number': story_count,
-                    'start_time': segment['timestamp_seconds'],
-                    'start_index': i,
-                    'boundary_text': segment['text'][:100] + '...',
-                    'segments': []
-                }
+            pause_indices = pause_segment_indices(pauses, parsed.segment_starts)
+            for segment_index, gap in zip(pause_indices[keep].tolist(), pauses.gaps[keep].tolist()):
+                boundary_hits.setdefault(segment_index, ('pause', f"[pause {gap:.1f}s]", None))
             
-            # Add segment to current story
-            if current_story:
-                current_story['segments'].append(segment)
+            # Pauses only mark where a story ends; the text before the first gap is story 1
+            boundary_hits.setdefault(0, ('start', '[start]', None))
         
-        # Close final story
-        if current_story:
-            current_story['end_time'] = text_segments[-1]['timestamp_seconds'] if text_segments else 0
-            current_story['end_index'] = len(text_segments) - 1
-            stories.append(current_story)
+        stories = []
+        start_indices = sorted(boundary_hits)
+        last_index = len(parsed) - 1
+        for story_number, start_index in enumerate(start_indices, 1):
+            boundary_type, boundary_match, char_offset = boundary_hits[start_index]
+            
+            # A story ends where the next one starts, or at the end of the transcript
+            if story_number < len(start_indices):
+                next_index = start_indices[story_number]
+                end_time = int(timestamps[next_index])
+                end_index = next_index - 1
+            else:
+                end_time = int(timestamps[last_index])
+                end_index = last_index
+            
+            stories.append({
+                'story_number': story_number,
+                'start_time': int(timestamps[start_index]),
+                'start_index': start_index,
+                'end_time': end_time,
+                'end_index': end_index,
+                'boundary_text': parsed.segment_text(start_index)[:100] + '...',
+                'boundary_type': boundary_type,
+                'boundary_match': boundary_match,
+                'boundary_char_offset': char_offset
+            })
         
         return stories
     
+    def _find_transcript(self, video_id: str) -> Optional[Path]:
+        """The video's canonical transcript from the transcript store."""
+        return self.transcript_store.resolve(video_id)
+    
     def analyze_video_structure(self, video_id: str, channel_name: str) -> Dict:
         """Analyze the structure of a single video."""
         logger.info(f"Analyzing structure for video: {video_id}")
         
         # Find transcript file
-        transcript_file = None
-        for suffix in ['.en-orig.vtt', '.en.vtt', '.vtt']:
-            potential_file = self.transcripts_dir / f"{video_id}{suffix}"
-            if potential_file.exists():
-                transcript_file = potential_file
-                break
-        
+        transcript_file = self._find_transcript(video_id)
         if not transcript_file:
             logger.warning(f"No transcript found for {video_id}")
             return {}
@@ -189,21 +193,51 @@ class ContentStructureAnalyzer:
         # Get video metadata
         video_metadata = self._get_video_metadata(video_id, channel_name)
         
-        # Clean transcript
-        text_segments = self.clean_vtt_transcript(transcript_file)
-        if not text_segments:
+        # Reuse the structure computed for identical transcript and analyzer settings
+        content_hash = file_hash(transcript_file)
+        cache_file = self.analysis_cache_dir / f"{self._analysis_key(content_hash)}.json"
+        structure = self._load_cached_structure(cache_file)
+        
+        if structure is None:
+            # Load parsed transcript (cached across runs)
+            try:
+                parsed = self.transcript_cache.load(transcript_file, content_hash)
+            except Exception as e:
+                logger.error(f"Error loading transcript {transcript_file}: {e}")
+                return {}
+            
+            structure = self._analyze_parsed_transcript(parsed)
+            if not structure:
+                return {}
+            self._store_cached_structure(cache_file, structure)
+        else:
+            logger.debug(f"Reusing cached structure for {video_id}")
+        
+        return {
+            'video_id': video_id,
+            'channel': channel_name,
+            'metadata': video_metadata,
+            **structure
+        }
+    
+    def _analyze_parsed_transcript(self, parsed: ParsedTranscript) -> Dict:
+        """Story structure and pacing statistics of a parsed transcript."""
+        if not len(parsed):
             return {}
         
         # Identify stories
-        stories = self.identify_story_boundaries(text_segments)
+        stories = self.identify_story_boundaries(parsed)
+        
+        # Word-level pacing from inline caption timings
+        word_timings = parsed.word_timings
         
         # Calculate story statistics
-        total_duration = text_segments[-1]['timestamp_seconds'] if text_segments else 0
+        total_duration = int(parsed.segment_starts[-1])
         
         story_stats = []
         for story in stories:
             duration = story['end_time'] - story['start_time']
-            word_count = sum(len(seg['text'].split()) for seg in story['segments'])
+            word_count = parsed.word_count_between(story['start_index'], story['end_index'])
             
             story_stats.append({
                 'story_number': story['story_number'],
@@ -211,41 +245,64 @@ class ContentStructureAnalyzer:
                 'duration_seconds': duration,
                 'duration_minutes': round(duration / 60, 1),
                 'word_count': word_count,
-                'boundary_text': story['boundary_text']
+                'boundary_text': story['boundary_text'],
+                'boundary_type': story['boundary_type']
             })
         
-        analysis = {
-            'video_id': video_id,
-            'channel': channel_name,
-            'metadata': video_metadata,
+        return {
             'total_duration_seconds': total_duration,
             'total_duration_minutes': round(total_duration / 60, 1),
             'story_count': len(stories),
             'stories': story_stats,
             'average_story_duration': round(total_duration / len(stories) / 60, 1) if stories else 0,
-            'transcript_segments': len(text_segments)
+            'transcript_segments': len(parsed),
+            'word_count': len(word_timings),
+            'words_per_minute': round(words_per_minute(word_timings.starts), 1),
+            'long_pauses': int(len(find_pauses(word_timings.starts)))
         }
-        
-        return analysis
     
-    def _get_video_metadata(self, video_id: str, channel_name: str) -> Dict:
-        """Get video metadata from analysis summary."""
+    def _analysis_key(self, content_hash: str) -> str:
+        """Cache key covering the transcript and every setting that affects the structure."""
+        settings = {
+            'analyzer_version': ANALYZER_VERSION,
+            # Content hash plus parser and cache format versions, so parser fixes invalidate too
+            'transcript_key': self.transcript_cache.cache_key(content_hash),
+            'dedup_window': DEDUP_WINDOW,
+            'story_markers': self.story_markers,
+            'carry_chars': self.boundary_scanner.carry_chars,
+            'segmentation': self.segmentation,
+            'pause_params': self.pause_params if self.segmentation != 'phrases' else None
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _load_cached_structure(self, cache_file: Path) -> Optional[Dict]:
         try:
-            channel_data = self.video_data.get('channels', {}).get(channel_name, {})
-            videos = channel_data.get('videos', [])
-            
-            for video in videos:
-                if video.get('id') == video_id:
-                    return {
-                        'title': video.get('title', ''),
-                        'view_count': video.get('view_count', 0),
-                        'duration': video.get('duration', ''),
-                        'url': video.get('url', '')
-                    }
-        except:
-            pass
+            with open(cache_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable structure cache {cache_file.name}: {e}")
+            return None
+    
+    def _store_cached_structure(self, cache_file: Path, structure: Dict):
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(structure, f)
+        os.replace(tmp_file, cache_file)
+    
+    def _get_video_metadata(self, video_id: str, channel_name: str) -> Dict:
+        """Get video metadata from the corpus store."""
+        video = self.corpus_store.get_video(video_id)
+        if not video:
+            return {}
         
-        return {}
+        return {
+            'title': video.get('title', ''),
+            'view_count': video.get('view_count', 0),
+            'duration': video.get('duration', ''),
+            'url': video.get('url', '')
+        }
     
     def _seconds_to_timestamp(self, seconds: int) -> str:
         """Convert seconds to HH:MM:SS format."""
@@ -258,8 +315,7 @@ class ContentStructureAnalyzer:
         """Analyze structure for all videos from a channel."""
         logger.info(f"Analyzing channel structure: {channel_name}")
         
-        channel_data = self.video_data.get('channels', {}).get(channel_name, {})
-        videos = channel_data.get('videos', [])
+        videos = self.corpus_store.channel_videos(channel_name)
         
         if not videos:
             logger.warning(f"No videos found for channel: {channel_name}")
@@ -275,35 +331,45 @@ class ContentStructureAnalyzer:
             'summary': {}
         }
         
-        all_story_counts = []
-        all_durations = []
-        all_avg_story_lengths = []
-        
         for video in videos_to_analyze:
             video_id = video.get('id')
             if video_id:
                 analysis = self.analyze_video_structure(video_id, channel_name)
                 if analysis:
                     channel_analysis['videos'].append(analysis)
-                    
-                    # Collect stats for summary
-                    all_story_counts.append(analysis['story_count'])
-                    all_durations.append(analysis['total_duration_minutes'])
-                    if analysis['average_story_duration'] > 0:
-                        all_avg_story_lengths.append(analysis['average_story_duration'])
-        
-        # Calculate channel summary statistics
-        if channel_analysis['videos']:
-            channel_analysis['summary'] = {
-                'avg_stories_per_video': round(sum(all_story_counts) / len(all_story_counts), 1),
-                'avg_video_duration_minutes': round(sum(all_durations) / len(all_durations), 1),
-                'avg_story_duration_minutes': round(sum(all_avg_story_lengths) / len(all_avg_story_lengths), 1) if all_avg_story_lengths else 0,
-                'total_stories_analyzed': sum(all_story_counts),
-                'story_count_range': f"{min(all_story_counts)}-{max(all_story_counts)}" if all_story_counts else "0"
-            }
         
+        channel_analysis['summary'] = self._summarize_channel(channel_analysis['videos'])
         return channel_analysis
     
+    def _summarize_channel(self, video_analyses: List[Dict]) -> Dict:
+        """Calculate channel summary statistics from per-video analyses."""
+        return self._summary_from_accumulators(self._channel_accumulators(video_analyses))
+    
+    def _channel_accumulators(self, video_analyses: List[Dict]) -> AccumulatorSet:
+        """Mergeable per-channel statistics of per-video analyses."""
+        accumulators = AccumulatorSet()
+        for analysis in video_analyses:
+            accumulators.add('story_count', analysis['story_count'])
+            accumulators.add('video_duration_minutes', analysis['total_duration_minutes'])
+            if analysis['average_story_duration'] > 0:
+                accumulators.add('story_duration_minutes', analysis['average_story_duration'])
+        return accumulators
+    
+    def _summary_from_accumulators(self, accumulators: AccumulatorSet) -> Dict:
+        """Channel summary from (possibly merged) accumulators."""
+        story_counts = accumulators['story_count']
+        if not story_counts.count:
+            return {}
+        
+        story_durations = accumulators['story_duration_minutes']
+        return {
+            'avg_stories_per_video': round(story_counts.mean, 1),
+            'avg_video_duration_minutes': round(accumulators['video_duration_minutes'].mean, 1),
+            'avg_story_duration_minutes': round(story_durations.mean, 1) if story_durations.count else 0,
+            'total_stories_analyzed': int(story_counts.total),
+            'story_count_range': f"{story_counts.minimum}-{story_counts.maximum}"
+        }
+    
     def run_structure_analysis(self, target_channels: List[str] = None) -> Dict:
         """Run complete structure analysis for specified channels."""
         if not target_channels:
@@ -320,7 +386,108 @@ class ContentStructureAnalyzer:
             if channel_analysis:
                 results['channels'][channel] = channel_analysis
         
-        # Save results
+        return self._save_results(results)
+    
+    def run_corpus_analysis(self, workers: Optional[int] = None,
+                            shard: Tuple[int, int] = (0, 1)) -> Dict:
+        """Analyze every video in the corpus (or one shard of it) on a process pool.
+        
+        With more than one shard, the shard's partial result is written to
+        structure_analysis/partials for reduce_corpus_analysis to combine.
+        """
+        partial = self._analyze_shard(workers, shard)
+        if shard[1] > 1:
+            output_file = write_partial(self.partials_dir, PARTIAL_PREFIX, shard, partial)
+            logger.info(f"Shard {shard[0]}/{shard[1]} saved to {output_file}")
+            return partial
+        return self._save_results(self._reduce_partials([partial]))
+    
+    def reduce_corpus_analysis(self, shard_count: Optional[int] = None) -> Dict:
+        """Combine the partial results of every shard into the corpus analysis."""
+        partials = load_partials(self.partials_dir, PARTIAL_PREFIX, shard_count)
+        logger.info(f"Reducing {len(partials)} shard partials")
+        return self._save_results(self._reduce_partials(partials))
+    
+    def _analyze_shard(self, workers: Optional[int], shard: Tuple[int, int]) -> Dict:
+        """Per-channel video analyses and accumulators for the videos of one shard."""
+        shard_index, shard_count = shard
+        channels = {
+            channel_name: self.corpus_store.channel_videos(channel_name)
+            for channel_name in self.corpus_store.channel_names()
+        }
+        jobs = [
+            (video['id'], channel_name, position)
+            for channel_name, videos in channels.items()
+            for position, video in enumerate(videos)
+            if shard_of(video['id'], shard_count) == shard_index
+        ]
+        
+        workers = workers or os.cpu_count() or 1
+        logger.info(f"Analyzing {len(jobs)} videos from {len(channels)} channels with {workers} workers")
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(self.research_dir), self.segmentation,
+                                           self.pause_params)) as executor:
+            analyses = list(executor.map(_analyze_video_job, [job[:2] for job in jobs]))
+        
+        partial_channels = {
+            channel_name: {'videos_listed': 0, 'videos': []}
+            for channel_name in channels
+        }
+        for (video_id, channel_name, position), analysis in zip(jobs, analyses):
+            channel = partial_channels[channel_name]
+            channel['videos_listed'] += 1
+            if analysis:
+                channel['videos'].append([position, analysis])
+        
+        for channel in partial_channels.values():
+            channel['accumulators'] = self._channel_accumulators(
+                [analysis for _, analysis in channel['videos']]
+            ).to_dict()
+        
+        return {
+            'analyzer_version': ANALYZER_VERSION,
+            'channels': partial_channels
+        }
+    
+    def _reduce_partials(self, partials: List[Dict]) -> Dict:
+        """Merge shard partials; the result does not depend on how videos were sharded."""
+        versions = {partial['analyzer_version'] for partial in partials}
+        if len(versions) > 1:
+            raise ValueError(f"Shard partials come from different analyzer versions: {sorted(versions)}")
+        
+        merged = {}
+        for partial in partials:
+            for channel_name, channel in partial['channels'].items():
+                target = merged.setdefault(channel_name, {
+                    'videos_listed': 0, 'videos': [], 'accumulators': AccumulatorSet()
+                })
+                target['videos_listed'] += channel['videos_listed']
+                target['videos'].extend(channel['videos'])
+                target['accumulators'].merge(AccumulatorSet.from_dict(channel['accumulators']))
+        
+        results = {
+            'analysis_date': datetime.now().strftime('%Y-%m-%d'),
+            'channels_analyzed': len(merged),
+            'channels': {}
+        }
+        
+        for channel_name, channel in merged.items():
+            if not channel['videos_listed']:
+                continue
+            # Restore listing order across shards
+            videos = [analysis for _, analysis in sorted(channel['videos'], key=lambda item: item[0])]
+            results['channels'][channel_name] = {
+                'channel_name': channel_name,
+                'videos_analyzed': channel['videos_listed'],
+                'videos': videos,
+                'summary': self._summary_from_accumulators(channel['accumulators'])
+            }
+        
+        return results
+    
+    def _save_results(self, results: Dict) -> Dict:
+        """Save structure analysis results."""
         output_file = self.output_dir / 'content_structure_analysis.json'
         with open(output_file, 'w') as f:
             json.dump(results, f, indent=2)
@@ -329,13 +496,53 @@ class ContentStructureAnalyzer:
         return results
 
 
+# Per-process analyzer used by run_corpus_analysis workers
+_worker_analyzer = None
+
+
+def _init_worker(research_dir: str, segmentation: str, pause_params: Dict):
+    global _worker_analyzer
+    _worker_analyzer = ContentStructureAnalyzer(research_dir, segmentation, pause_params)
+
+
+def _analyze_video_job(job: Tuple[str, str]) -> Dict:
+    video_id, channel_name = job
+    try:
+        return _worker_analyzer.analyze_video_structure(video_id, channel_name)
+    except Exception as e:
+        logger.error(f"Error analyzing {video_id}: {e}")
+        return {}
+
 def main():
-    analyzer = ContentStructureAnalyzer()
+    parser = argparse.ArgumentParser(description='Horror Video Content Structure Analyzer')
+    parser.add_argument('--research-dir', default='research',
+                       help='Research directory (default: research)')
+    parser.add_argument('--corpus', action='store_true',
+                       help='Analyze every video in the corpus store on a process pool')
+    parser.add_argument('--workers', type=int,
+                       help='Worker processes for --corpus (default: CPU count)')
+    parser.add_argument('--segmentation', choices=SEGMENTATION_MODES, default='phrases',
+                       help='Story boundary source: phrases, pauses or hybrid (default: phrases)')
+    parser.add_argument('--shard', type=parse_shard, default=(0, 1), metavar='INDEX/COUNT',
+                       help='With --corpus, analyze only this shard of the videos and write a partial result')
+    parser.add_argument('--reduce', action='store_true',
+                       help='Combine the shard partials in structure_analysis/partials')
+    
+    args = parser.parse_args()
     
-    # Analyze key channels for structure patterns
-    target_channels = ['Let\'s Read Podcast', 'Mr. Nightmare']
+    analyzer = ContentStructureAnalyzer(args.research_dir, args.segmentation)
     
-    results = analyzer.run_structure_analysis(target_channels)
+    if args.reduce:
+        results = analyzer.reduce_corpus_analysis()
+    elif args.corpus:
+        results = analyzer.run_corpus_analysis(args.workers, args.shard)
+        if args.shard[1] > 1:
+            print(f"Shard {args.shard[0]}/{args.shard[1]} written; run --reduce once all shards finish")
+            return
+    else:
+        # Analyze key channels for structure patterns
+        target_channels = ['Let\'s Read Podcast', 'Mr. Nightmare']
+        results = analyzer.run_structure_analysis(target_channels)
     
     # Print summary
     print("\n📊 CONTENT STRUCTURE ANALYSIS SUMMARY")
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Compressed random-access transcript archive.
+Parsed transcripts (de-duplicated caption segments plus word timings) are
+stored in independently decodable zlib frames of about FRAME_SECONDS each, with
+a frame index by time and by word offset. Reading the first minute or the last
+few minutes of a video decodes only the frames that cover that range.
+
+Layout:
+    frames.bin   concatenated zlib frames
+    index.npz    per-frame byte offset/length, start/end time, first word and
+                 first segment; per-video first frame (len = videos + 1)
+    videos.json  video id, content hash, duration and word count per video
+
+Frame payload (little-endian): segment count, word count, text byte length;
+segment starts/ends (float32), words per segment (uint32), word starts
+(float32), then segment texts and words as newline-separated UTF-8.
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+import logging
+
+import numpy as np
+
+from transcript_cache import ParsedTranscript, TranscriptCache, file_hash
+from transcript_store import TranscriptStore
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Bump when the frame payload or index layout changes
+ARCHIVE_FORMAT_VERSION = 1
+
+FRAME_SECONDS = 30.0
+COMPRESSION_LEVEL = 9
+
+_HEADER = struct.Struct('<III')
+
+INDEX_ARRAYS = ('frame_offsets', 'frame_lengths', 'frame_starts', 'frame_ends',
+                'frame_first_word', 'frame_first_segment', 'video_first_frame')
+
+
+class ArchiveSlice(NamedTuple):
+    """Decoded segments and words of a run of frames."""
+    segment_starts: np.ndarray  # float32 seconds
+    segment_ends: np.ndarray  # float32 seconds
+    segment_texts: List[str]
+    segment_word_counts: np.ndarray  # uint32 words per segment
+    word_starts: np.ndarray  # float32 seconds
+    words: List[str]  # Normalized words
+    first_word: int  # Word offset of words[0] within the video
+
+    @property
+    def text(self) -> str:
+        return ' '.join(self.segment_texts)
+
+
+def encode_frame(segment_starts: np.ndarray, segment_ends: np.ndarray, segment_word_counts: np.ndarray,
+                 segment_texts: List[str], word_starts: np.ndarray, words: List[str]) -> bytes:
+    text = '\n'.join(segment_texts).encode('utf-8')
+    payload = b''.join([
+        _HEADER.pack(len(segment_starts), len(word_starts), len(text)),
+        np.asarray(segment_starts, dtype='<f4').tobytes(),
+        np.asarray(segment_ends, dtype='<f4').tobytes(),
+        np.asarray(segment_word_counts, dtype='<u4').tobytes(),
+        np.asarray(word_starts, dtype='<f4').tobytes(),
+        text,
+        '\n'.join(words).encode('utf-8')
+    ])
+    return zlib.compress(payload, COMPRESSION_LEVEL)
+
+
+def decode_frame(frame: bytes):
+    """(segment_starts, segment_ends, segment_word_counts, segment_texts, word_starts, words)"""
+    payload = zlib.decompress(frame)
+    segments, word_count, text_length = _HEADER.unpack_from(payload)
+    position = _HEADER.size
+
+    def take(dtype: str, count: int) -> np.ndarray:
+        nonlocal position
+        values = np.frombuffer(payload, dtype=dtype, count=count, offset=position)
+        position += values.nbytes
+        return values
+
+    segment_starts = take('<f4', segments)
+    segment_ends = take('<f4', segments)
+    segment_word_counts = take('<u4', segments)
+    word_starts = take('<f4', word_count)
+    text = payload[position:position + text_length].decode('utf-8')
+    words_text = payload[position + text_length:].decode('utf-8')
+    return (segment_starts, segment_ends, segment_word_counts,
+            text.split('\n') if segments else [], word_starts,
+            words_text.split('\n') if word_count else [])
+
+
+class TranscriptArchive:
+    """Append-only frame archive with a time and word-offset index."""
+
+    def __init__(self, archive_dir: Union[str, Path] = "research/transcript_archive"):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.frames_file = self.archive_dir / 'frames.bin'
+        self.index_file = self.archive_dir / 'index.npz'
+        self.videos_file = self.archive_dir / 'videos.json'
+        self._load()
+
+    def _load(self):
+        self.videos: List[Dict] = []
+        self.positions: Dict[str, int] = {}  # Video id -> latest entry in self.videos
+        self.index = {
+            'frame_offsets': np.empty(0, dtype=np.uint64),
+            'frame_lengths': np.empty(0, dtype=np.uint32),
+            'frame_starts': np.empty(0, dtype=np.float32),
+            'frame_ends': np.empty(0, dtype=np.float32),
+            'frame_first_word': np.empty(0, dtype=np.uint32),
+            'frame_first_segment': np.empty(0, dtype=np.uint32),
+            'video_first_frame': np.zeros(1, dtype=np.uint32),
+        }
+        if not (self.videos_file.exists() and self.index_file.exists() and self.frames_file.exists()):
+            return
+
+        with open(self.videos_file, 'r') as f:
+            videos = json.load(f)
+        if videos.get('format_version') != ARCHIVE_FORMAT_VERSION:
+            logger.info("Archive format changed, starting a new archive")
+            return
+        with np.load(self.index_file) as index:
+            self.index = {name: index[name] for name in INDEX_ARRAYS}
+        self.videos = videos['videos']
+        self.positions = {video['video_id']: i for i, video in enumerate(self.videos)}
+
+    # Writing
+
+    def add_transcripts(self, transcripts, transcript_cache: Optional[TranscriptCache] = None,
+                        frame_seconds: float = FRAME_SECONDS) -> int:
+        """Append (video_id, transcript_file) pairs that are new or changed; returns videos added."""
+        transcript_cache = transcript_cache or TranscriptCache(self.archive_dir.parent / ".cache" / "transcripts")
+        current = {video['video_id']: video for video in self.latest_videos()}
+
+        added = 0
+        new_frames = {name: [] for name in INDEX_ARRAYS if name != 'video_first_frame'}
+        first_frames = [int(v) for v in self.index['video_first_frame']]
+        offset = self.frames_file.stat().st_size if self.frames_file.exists() else 0
+
+        with open(self.frames_file, 'ab') as frames_out:
+            for video_id, transcript_file in transcripts:
+                content_hash = file_hash(transcript_file)
+                if video_id in current and current[video_id]['content_hash'] == content_hash:
+                    continue
+                parsed = transcript_cache.load(transcript_file, content_hash)
+
+                frame_count = 0
+                for frame in self._frames(parsed, frame_seconds):
+                    data, start, end, first_word, first_segment = frame
+                    frame_count += 1
+                    frames_out.write(data)
+                    new_frames['frame_offsets'].append(offset)
+                    new_frames['frame_lengths'].append(len(data))
+                    new_frames['frame_starts'].append(start)
+                    new_frames['frame_ends'].append(end)
+                    new_frames['frame_first_word'].append(first_word)
+                    new_frames['frame_first_segment'].append(first_segment)
+                    offset += len(data)
+
+                first_frames.append(first_frames[-1] + frame_count)
+                self.videos.append({
+                    'video_id': video_id,
+                    'content_hash': content_hash,
+                    'duration': float(parsed.segment_ends[-1]) if len(parsed) else 0.0,
+                    'words': parsed.word_count,
+                    'segments': len(parsed)
+                })
+                added += 1
+
+        if added:
+            dtypes = {name: values.dtype for name, values in self.index.items()}
+            for name, values in new_frames.items():
+                self.index[name] = np.concatenate([self.index[name], np.asarray(values, dtype=dtypes[name])])
+            self.index['video_first_frame'] = np.asarray(first_frames, dtype=np.uint32)
+            self._save_index()
+        return added
+
+    @staticmethod
+    def _frame_bounds(parsed: ParsedTranscript, frame_seconds: float) -> np.ndarray:
+        """Segment index where each frame starts, plus the end (len = frames + 1)."""
+        if not len(parsed):
+            return np.zeros(1, dtype=np.int64)
+        starts = np.asarray(parsed.segment_starts, dtype=np.float64)
+        # Frames cover fixed time buckets, so frame k starts at the first segment in bucket k
+        buckets = np.floor((starts - starts[0]) / frame_seconds).astype(np.int64)
+        boundaries = np.flatnonzero(np.diff(buckets)) + 1
+        return np.concatenate([[0], boundaries, [len(starts)]])
+
+    def _frames(self, parsed: ParsedTranscript, frame_seconds: float):
+        bounds = self._frame_bounds(parsed, frame_seconds)
+        word_offsets = parsed.segment_word_offsets
+        words = parsed.word_timings.vocabulary.words
+        token_ids = parsed.word_timings.token_ids
+        for begin, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            first_word, last_word = int(word_offsets[begin]), int(word_offsets[end])
+            data = encode_frame(
+                parsed.segment_starts[begin:end],
+                parsed.segment_ends[begin:end],
+                np.diff(word_offsets[begin:end + 1]),
+                [parsed.segment_text(i) for i in range(begin, end)],
+                parsed.word_timings.starts[first_word:last_word],
+                [words[t] for t in token_ids[first_word:last_word].tolist()]
+            )
+            yield (data, float(parsed.segment_starts[begin]), float(np.max(parsed.segment_ends[begin:end])),
+                   first_word, begin)
+
+    def _save_index(self):
+        tmp_index = self.archive_dir / 'index.tmp.npz'
+        np.savez(tmp_index, **self.index)
+        os.replace(tmp_index, self.index_file)
+        tmp_videos = self.videos_file.with_suffix('.tmp')
+        with open(tmp_videos, 'w') as f:
+            json.dump({'format_version': ARCHIVE_FORMAT_VERSION, 'videos': self.videos}, f, indent=2)
+        os.replace(tmp_videos, self.videos_file)
+        self.positions = {video['video_id']: i for i, video in enumerate(self.videos)}
+
+    def compact(self):
+        """Rewrite the archive without frames of superseded video versions."""
+        latest = self.latest_videos()
+        if len(latest) == len(self.videos):
+            return
+
+        tmp_frames = self.archive_dir / 'frames.tmp'
+        index = {name: [] for name in INDEX_ARRAYS if name != 'video_first_frame'}
+        first_frames = [0]
+        offset = 0
+        with open(self.frames_file, 'rb') as frames_in, open(tmp_frames, 'wb') as frames_out:
+            for video in latest:
+                for frame in self._frame_range(video['video_id']):
+                    frames_in.seek(int(self.index['frame_offsets'][frame]))
+                    data = frames_in.read(int(self.index['frame_lengths'][frame]))
+                    frames_out.write(data)
+                    index['frame_offsets'].append(offset)
+                    for name in ('frame_lengths', 'frame_starts', 'frame_ends',
+                                 'frame_first_word', 'frame_first_segment'):
+                        index[name].append(self.index[name][frame])
+                    offset += len(data)
+                first_frames.append(first_frames[-1] + len(self._frame_range(video['video_id'])))
+
+        dtypes = {name: values.dtype for name, values in self.index.items()}
+        self.index = {name: np.asarray(values, dtype=dtypes[name]) for name, values in index.items()}
+        self.index['video_first_frame'] = np.asarray(first_frames, dtype=np.uint32)
+        self.videos = latest
+        os.replace(tmp_frames, self.frames_file)
+        self._save_index()
+
+    # Reading
+
+    def latest_videos(self) -> List[Dict]:
+        """The most recently archived version of every video, in archive order."""
+        return [video for i, video in enumerate(self.videos) if self.positions.get(video['video_id']) == i]
+
+    def _frame_range(self, video_id: str) -> range:
+        position = self.positions.get(video_id)
+        if position is None:
+            raise KeyError(f"{video_id} is not in the archive")
+        first_frames = self.index['video_first_frame']
+        return range(int(first_frames[position]), int(first_frames[position + 1]))
+
+    def duration(self, video_id: str) -> float:
+        return self.videos[self.positions[video_id]]['duration']
+
+    def read_time(self, video_id: str, start: float = 0.0, end: Optional[float] = None) -> ArchiveSlice:
+        """Segments starting in [start, end) seconds, decoding only the frames that cover them."""
+        frames = self._frame_range(video_id)
+        if not len(frames):
+            return self._empty_slice()
+        frame_starts = self.index['frame_starts'][frames.start:frames.stop]
+        first = max(0, int(np.searchsorted(frame_starts, start, side='right')) - 1)
+        last = len(frames) if end is None else int(np.searchsorted(frame_starts, end, side='left'))
+        result = self._decode(frames.start + first, frames.start + min(max(last, first + 1), len(frames)))
+
+        keep = result.segment_starts >= start
+        if end is not None:
+            keep &= result.segment_starts < end
+        return self._select_segments(result, keep)
+
+    def read_words(self, video_id: str, first_word: int, count: int) -> ArchiveSlice:
+        """Segments holding words first_word .. first_word + count - 1."""
+        frames = self._frame_range(video_id)
+        if not len(frames):
+            return self._empty_slice()
+        frame_first_word = self.index['frame_first_word'][frames.start:frames.stop]
+        first = max(0, int(np.searchsorted(frame_first_word, first_word, side='right')) - 1)
+        last = int(np.searchsorted(frame_first_word, first_word + count, side='left'))
+        result = self._decode(frames.start + first, frames.start + min(max(last, first + 1), len(frames)))
+
+        word_ends = result.first_word + np.cumsum(result.segment_word_counts, dtype=np.int64)
+        word_begins = word_ends - result.segment_word_counts
+        keep = (word_ends > first_word) & (word_begins < first_word + count)
+        return self._select_segments(result, keep)
+
+    def head(self, video_id: str, seconds: float = 60.0) -> ArchiveSlice:
+        """The first `seconds` of a video (hooks)."""
+        frames = self._frame_range(video_id)
+        start = float(self.index['frame_starts'][frames.start]) if len(frames) else 0.0
+        return self.read_time(video_id, 0.0, start + seconds)
+
+    def tail(self, video_id: str, seconds: float = 300.0) -> ArchiveSlice:
+        """The last `seconds` of a video (endings)."""
+        return self.read_time(video_id, max(0.0, self.duration(video_id) - seconds))
+
+    @staticmethod
+    def _empty_slice(first_word: int = 0) -> ArchiveSlice:
+        empty = np.empty(0, dtype=np.float32)
+        return ArchiveSlice(empty, empty, [], np.empty(0, dtype=np.uint32), empty, [], first_word)
+
+    def _decode(self, first_frame: int, end_frame: int) -> ArchiveSlice:
+        if end_frame <= first_frame:
+            return self._empty_slice()
+        parts = []
+        with open(self.frames_file, 'rb') as f:
+            f.seek(int(self.index['frame_offsets'][first_frame]))
+            data = f.read(int(np.sum(self.index['frame_lengths'][first_frame:end_frame], dtype=np.uint64)))
+        position = 0
+        for length in self.index['frame_lengths'][first_frame:end_frame].tolist():
+            parts.append(decode_frame(data[position:position + length]))
+            position += length
+
+        empty = np.empty(0, dtype=np.float32)
+        return ArchiveSlice(
+            np.concatenate([p[0] for p in parts]) if parts else empty,
+            np.concatenate([p[1] for p in parts]) if parts else empty,
+            [text for p in parts for text in p[3]],
+            np.concatenate([p[2] for p in parts]) if parts else np.empty(0, dtype=np.uint32),
+            np.concatenate([p[4] for p in parts]) if parts else empty,
+            [word for p in parts for word in p[5]],
+            int(self.index['frame_first_word'][first_frame]) if end_frame > first_frame else 0
+        )
+
+    def _select_segments(self, result: ArchiveSlice, keep: np.ndarray) -> ArchiveSlice:
+        """Restrict a decoded run of frames to a contiguous subset of its segments."""
+        kept = np.flatnonzero(keep)
+        if not len(kept):
+            return self._empty_slice(result.first_word)
+        begin, end = int(kept[0]), int(kept[-1]) + 1
+        word_offsets = np.concatenate([[0], np.cumsum(result.segment_word_counts, dtype=np.int64)])
+        first, last = int(word_offsets[begin]), int(word_offsets[end])
+        return ArchiveSlice(
+            result.segment_starts[begin:end],
+            result.segment_ends[begin:end],
+            result.segment_texts[begin:end],
+            result.segment_word_counts[begin:end],
+            result.word_starts[first:last],
+            result.words[first:last],
+            result.first_word + first
+        )
+
+    def stats(self) -> Dict:
+        latest = self.latest_videos()
+        return {
+            'videos': len(latest),
+            'frames': len(self.index['frame_offsets']),
+            'archive_bytes': self.frames_file.stat().st_size if self.frames_file.exists() else 0,
+            'words': sum(video['words'] for video in latest)
+        }
+
+
+def _print_slice(video_id: str, archive_slice: ArchiveSlice, elapsed_ms: float):
+    for start, text in zip(archive_slice.segment_starts.tolist(), archive_slice.segment_texts):
+        minutes, seconds = divmod(int(start), 60)
+        print(f"[{minutes:02d}:{seconds:02d}] {text}")
+    print(f"\n{video_id}: {len(archive_slice.segment_texts)} segments, "
+          f"{len(archive_slice.words)} words ({elapsed_ms:.1f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compressed random-access transcript archive')
+    parser.add_argument('--research-dir', default='research',
+                       help='Research directory (default: research)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Archive new or changed transcripts')
+    build_parser.add_argument('--compact', action='store_true',
+                              help='Drop frames of superseded transcript versions afterwards')
+    for command, default, help_text in (('head', 60.0, 'Print the first N seconds of a video'),
+                                        ('tail', 300.0, 'Print the last N seconds of a video')):
+        read_parser = subparsers.add_parser(command, help=help_text)
+        read_parser.add_argument('video_id')
+        read_parser.add_argument('--seconds', type=float, default=default,
+                                 help=f'Seconds to read (default: {default:g})')
+    subparsers.add_parser('stats', help='Show archive size')
+
+    args = parser.parse_args()
+    research_dir = Path(args.research_dir)
+    archive = TranscriptArchive(research_dir / 'transcript_archive')
+
+    if args.command == 'build':
+        added = archive.add_transcripts(TranscriptStore(research_dir).transcripts(),
+                                        TranscriptCache(research_dir / '.cache' / 'transcripts'))
+        if args.compact:
+            archive.compact()
+        print(f"Archived {added} new or changed videos")
+    elif args.command in ('head', 'tail'):
+        start = time.perf_counter()
+        read = archive.head if args.command == 'head' else archive.tail
+        archive_slice = read(args.video_id, args.seconds)
+        _print_slice(args.video_id, archive_slice, (time.perf_counter() - start) * 1000)
+        return
+
+    stats = archive.stats()
+    print(f"Videos: {stats['videos']}, frames: {stats['frames']}, words: {stats['words']:,}")
+    print(f"Archive size: {stats['archive_bytes'] / 1e6:.2f} MB")
+
+
+if __name__ == '__main__':
+    main()
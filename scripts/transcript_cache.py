@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of parsed transcripts.
+Each transcript is parsed once into flat arrays (segments, de-duplicated text,
+word timings) stored as .npy files that are memory-mapped on later runs.
+Entries are keyed by the transcript's content hash and the parser version, so
+edited files or parser changes invalidate the cache automatically.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, List, Union
+import logging
+
+import numpy as np
+
+from vtt_parser import PARSER_VERSION, iter_deduplicated_cues
+from word_timings import Vocabulary, WordTimings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes
+CACHE_FORMAT_VERSION = 2
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParsedTranscript:
+    """De-duplicated transcript held as flat arrays."""
+
+    def __init__(self, text: str, segment_starts: np.ndarray, segment_ends: np.ndarray,
+                 segment_offsets: np.ndarray, segment_word_offsets: np.ndarray,
+                 word_timings: WordTimings, content_hash: str = ''):
+        self.text = text
+        self.segment_starts = segment_starts  # float32 seconds, one per cue
+        self.segment_ends = segment_ends  # float32 seconds
+        self.segment_offsets = segment_offsets  # uint32 char offsets into text, len = segments + 1
+        self.segment_word_offsets = segment_word_offsets  # uint32 cumulative word counts, len = segments + 1
+        self.word_timings = word_timings
+        self.content_hash = content_hash
+
+    def __len__(self) -> int:
+        return len(self.segment_starts)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.word_timings)
+
+    def word_count_between(self, start_index: int, end_index: int) -> int:
+        """Words in segments start_index..end_index (inclusive), from the prefix sums."""
+        return int(self.segment_word_offsets[end_index + 1]) - int(self.segment_word_offsets[start_index])
+
+    def segment_text(self, index: int) -> str:
+        return self.text[self.segment_offsets[index]:self.segment_offsets[index + 1]].strip()
+
+    def segments(self) -> List[Dict]:
+        """Segments in the format used by ContentStructureAnalyzer."""
+        offsets = self.segment_offsets.tolist()
+        return [
+            {'timestamp_seconds': int(start), 'text': self.text[offsets[i]:offsets[i + 1]].strip()}
+            for i, start in enumerate(self.segment_starts.tolist())
+        ]
+
+    @classmethod
+    def from_vtt(cls, vtt_file: Union[str, Path], content_hash: str = '') -> 'ParsedTranscript':
+        """Parse a VTT file into flat arrays."""
+        vocabulary = Vocabulary()
+        pieces = []
+        segment_starts = array('f')
+        segment_ends = array('f')
+        segment_offsets = array('I', [0])
+        segment_word_offsets = array('I', [0])
+        word_starts = array('f')
+        token_ids = array('I')
+        offset = 0
+
+        for cue in iter_deduplicated_cues(vtt_file):
+            pieces.append(cue.text)
+            offset += len(cue.text) + 1
+            segment_starts.append(cue.start)
+            segment_ends.append(cue.end)
+            segment_offsets.append(offset)
+            for start, word in cue.words:
+                word_starts.append(start)
+                token_ids.append(vocabulary.encode(word))
+            segment_word_offsets.append(len(token_ids))
+
+        word_timings = WordTimings(
+            np.frombuffer(word_starts, dtype=np.float32),
+            np.frombuffer(token_ids, dtype=np.uint32),
+            vocabulary
+        )
+        # Each piece is followed by one separator so offsets stay aligned
+        text = ''.join(piece + ' ' for piece in pieces)
+        return cls(
+            text,
+            np.frombuffer(segment_starts, dtype=np.float32),
+            np.frombuffer(segment_ends, dtype=np.float32),
+            np.frombuffer(segment_offsets, dtype=np.uint32),
+            np.frombuffer(segment_word_offsets, dtype=np.uint32),
+            word_timings,
+            content_hash
+        )
+
+
+class TranscriptCache:
+    """Content-addressed on-disk cache of ParsedTranscript objects."""
+
+    ARRAYS = ('segment_starts', 'segment_ends', 'segment_offsets', 'segment_word_offsets',
+              'word_starts', 'token_ids')
+
+    def __init__(self, cache_dir: Union[str, Path] = "research/.cache/transcripts"):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def cache_key(self, content_hash: str) -> str:
+        return f"{content_hash}-p{PARSER_VERSION}-f{CACHE_FORMAT_VERSION}"
+
+    def load(self, vtt_file: Union[str, Path], content_hash: str = None) -> ParsedTranscript:
+        """Return the parsed transcript, parsing and storing it on a cache miss."""
+        content_hash = content_hash or file_hash(vtt_file)
+        entry_dir = self.cache_dir / self.cache_key(content_hash)
+
+        if entry_dir.exists():
+            try:
+                return self._read_entry(entry_dir, content_hash)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Discarding unreadable cache entry {entry_dir.name}: {e}")
+                shutil.rmtree(entry_dir, ignore_errors=True)
+
+        parsed = ParsedTranscript.from_vtt(vtt_file, content_hash)
+        self._write_entry(entry_dir, parsed, vtt_file)
+        return parsed
+
+    def _read_entry(self, entry_dir: Path, content_hash: str) -> ParsedTranscript:
+        arrays = {name: np.load(entry_dir / f"{name}.npy", mmap_mode='r') for name in self.ARRAYS}
+        text = (entry_dir / 'text.txt').read_text(encoding='utf-8')
+        vocab_text = (entry_dir / 'vocab.txt').read_text(encoding='utf-8')
+        vocabulary = Vocabulary(vocab_text.split('\n') if vocab_text else [])
+        return ParsedTranscript(
+            text,
+            arrays['segment_starts'],
+            arrays['segment_ends'],
+            arrays['segment_offsets'],
+            arrays['segment_word_offsets'],
+            WordTimings(arrays['word_starts'], arrays['token_ids'], vocabulary),
+            content_hash
+        )
+
+    def _write_entry(self, entry_dir: Path, parsed: ParsedTranscript, vtt_file: Union[str, Path]):
+        # Write into a temporary directory and rename, so readers never see partial entries
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp-'))
+        try:
+            arrays = {
+                'segment_starts': parsed.segment_starts,
+                'segment_ends': parsed.segment_ends,
+                'segment_offsets': parsed.segment_offsets,
+                'segment_word_offsets': parsed.segment_word_offsets,
+                'word_starts': parsed.word_timings.starts,
+                'token_ids': parsed.word_timings.token_ids,
+            }
+            for name, values in arrays.items():
+                np.save(tmp_dir / f"{name}.npy", values)
+            (tmp_dir / 'text.txt').write_text(parsed.text, encoding='utf-8')
+            (tmp_dir / 'vocab.txt').write_text('\n'.join(parsed.word_timings.vocabulary.words), encoding='utf-8')
+            with open(tmp_dir / 'meta.json', 'w') as f:
+                json.dump({
+                    'source': str(vtt_file),
+                    'content_hash': parsed.content_hash,
+                    'parser_version': PARSER_VERSION,
+                    'format_version': CACHE_FORMAT_VERSION,
+                    'segments': len(parsed),
+                    'words': parsed.word_count
+                }, f, indent=2)
+            os.replace(tmp_dir, entry_dir)
+        except OSError as e:
+            # Another process may have stored the same entry first
+            logger.debug(f"Could not store cache entry {entry_dir.name}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def prune(self) -> int:
+        """Remove entries written by other parser or format versions."""
+        suffix = f"-p{PARSER_VERSION}-f{CACHE_FORMAT_VERSION}"
+        removed = 0
+        for entry_dir in self.cache_dir.iterdir():
+            if entry_dir.is_dir() and not entry_dir.name.endswith(suffix):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                removed += 1
+        return removed
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Positional inverted index over de-duplicated transcripts.
+Answers phrase and proximity queries with (video, timestamp) hits, optionally
+restricted to a time window such as the first or last N seconds of a video.
+
+Layout: the index directory holds immutable segments plus a manifest. Each
+segment stores flat .npy arrays that are memory-mapped at query time:
+
+    tokens.npy       uint32  word stream of all documents, as segment term ids
+    starts.npy       float32 start time of every word (seconds)
+    doc_offsets.npy  uint32  word offset of each document, len = docs + 1
+    term_offsets.npy uint32  postings offset of each term, len = terms + 1
+    postings.npy     uint32  word offsets grouped by term, ascending within a term
+    vocab.txt        one normalized term per line (line number = term id)
+    docs.json        video id and content hash of each document
+
+New or changed videos are appended as a new segment; superseded documents in
+older segments are masked out through the manifest, and segments are merged
+once there are more than MAX_SEGMENTS.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+import logging
+
+import numpy as np
+
+from transcript_cache import TranscriptCache, file_hash
+from transcript_store import TranscriptStore
+from word_timings import Vocabulary, normalize_word
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes
+INDEX_FORMAT_VERSION = 1
+
+# Merge all segments into one when an update leaves more than this many
+MAX_SEGMENTS = 8
+
+SEGMENT_ARRAYS = ('tokens', 'starts', 'doc_offsets', 'term_offsets', 'postings')
+
+
+class IndexHit(NamedTuple):
+    """A query match."""
+    video_id: str
+    time: float  # Start time of the first matched word (seconds)
+    word_position: int  # Word offset within the video
+    duration: float  # Start time of the video's last word (seconds)
+
+
+class IndexSegment:
+    """One immutable, memory-mapped segment."""
+
+    def __init__(self, segment_dir: Path):
+        self.name = segment_dir.name
+        for name in SEGMENT_ARRAYS:
+            setattr(self, name, np.load(segment_dir / f"{name}.npy", mmap_mode='r'))
+        vocab_text = (segment_dir / 'vocab.txt').read_text(encoding='utf-8')
+        self.vocabulary = Vocabulary(vocab_text.split('\n') if vocab_text else [])
+        with open(segment_dir / 'docs.json', 'r') as f:
+            self.docs = json.load(f)
+        self.live = np.ones(len(self.docs), dtype=bool)
+
+    def term_postings(self, term: str) -> np.ndarray:
+        term_id = self.vocabulary.ids.get(term)
+        if term_id is None:
+            return np.empty(0, dtype=np.uint32)
+        return self.postings[self.term_offsets[term_id]:self.term_offsets[term_id + 1]]
+
+    def doc_of(self, word_offsets: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.doc_offsets, word_offsets, side='right') - 1
+
+    def doc_words(self, doc: int) -> Tuple[List[str], np.ndarray]:
+        """Words and start times of one document."""
+        begin, end = int(self.doc_offsets[doc]), int(self.doc_offsets[doc + 1])
+        return self.vocabulary.decode(self.tokens[begin:end].tolist()), self.starts[begin:end]
+
+
+class TranscriptIndex:
+    """Segmented positional index with incremental updates."""
+
+    def __init__(self, index_dir: Union[str, Path] = "research/.cache/index"):
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_file = self.index_dir / 'manifest.json'
+        self.manifest = self._load_manifest()
+        self._segments: Optional[List[IndexSegment]] = None
+
+    def _load_manifest(self) -> Dict:
+        empty = {'format_version': INDEX_FORMAT_VERSION, 'segments': [], 'videos': {}}
+        if not self.manifest_file.exists():
+            return empty
+        try:
+            with open(self.manifest_file, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable index manifest: {e}")
+            return empty
+        if manifest.get('format_version') != INDEX_FORMAT_VERSION:
+            logger.info("Index format changed, rebuilding from scratch")
+            return empty
+        return manifest
+
+    def _save_manifest(self):
+        tmp_file = self.manifest_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_file, self.manifest_file)
+
+    # Building
+
+    def update(self, videos: Iterable[Tuple[str, Union[str, Path]]],
+               transcript_cache: Optional[TranscriptCache] = None) -> int:
+        """Index (video_id, transcript_file) pairs whose content is new; returns videos added."""
+        transcript_cache = transcript_cache or TranscriptCache(self.index_dir.parent / "transcripts")
+        indexed = self.manifest['videos']
+
+        pending = []
+        for video_id, transcript_file in videos:
+            content_hash = file_hash(transcript_file)
+            entry = indexed.get(video_id)
+            if entry and entry['content_hash'] == content_hash:
+                continue
+            pending.append((video_id, content_hash, transcript_cache.load(transcript_file, content_hash)))
+
+        if not pending:
+            return 0
+
+        vocabulary = Vocabulary()
+        docs = []
+        documents = []
+        for video_id, content_hash, parsed in pending:
+            # Remap the per-video token ids onto the segment vocabulary
+            word_timings = parsed.word_timings
+            term_ids = np.array([vocabulary.add(word) for word in word_timings.vocabulary.words],
+                                dtype=np.uint32)
+            documents.append((term_ids[word_timings.token_ids] if len(term_ids) else
+                              np.empty(0, dtype=np.uint32), word_timings.starts))
+            docs.append({'video_id': video_id, 'content_hash': content_hash})
+
+        segment_name = self._write_segment(vocabulary, docs, documents)
+        for doc, entry in enumerate(docs):
+            indexed[entry['video_id']] = {
+                'segment': segment_name,
+                'doc': doc,
+                'content_hash': entry['content_hash']
+            }
+        self.manifest['segments'].append(segment_name)
+        self._drop_dead_segments()
+        self._save_manifest()
+        self._segments = None
+
+        if len(self.manifest['segments']) > MAX_SEGMENTS:
+            self.merge()
+
+        logger.info(f"Indexed {len(pending)} videos into segment {segment_name}")
+        return len(pending)
+
+    def merge(self):
+        """Rewrite all live documents into a single segment."""
+        vocabulary = Vocabulary()
+        docs = []
+        documents = []
+        for segment in self.segments():
+            # Map segment term ids onto the merged vocabulary once per segment
+            term_ids = np.array([vocabulary.add(word) for word in segment.vocabulary.words], dtype=np.uint32)
+            for doc in np.flatnonzero(segment.live):
+                begin, end = int(segment.doc_offsets[doc]), int(segment.doc_offsets[doc + 1])
+                documents.append((term_ids[segment.tokens[begin:end]], segment.starts[begin:end]))
+                docs.append(segment.docs[doc])
+
+        if not docs:
+            return
+
+        segment_name = self._write_segment(vocabulary, docs, documents)
+        self.manifest['segments'] = [segment_name]
+        for doc, entry in enumerate(docs):
+            self.manifest['videos'][entry['video_id']].update(segment=segment_name, doc=doc)
+        self._segments = None
+        self._drop_dead_segments()
+        self._save_manifest()
+        logger.info(f"Merged index into segment {segment_name} ({len(docs)} videos)")
+
+    def _write_segment(self, vocabulary: Vocabulary, docs: List[Dict],
+                       documents: List[Tuple[np.ndarray, np.ndarray]]) -> str:
+        tokens = np.concatenate([tokens for tokens, _ in documents]).astype(np.uint32)
+        starts = np.concatenate([starts for _, starts in documents]).astype(np.float32)
+        doc_offsets = np.zeros(len(documents) + 1, dtype=np.uint32)
+        doc_offsets[1:] = np.cumsum([len(tokens_) for tokens_, _ in documents])
+
+        # A stable sort by term keeps each term's postings in word order
+        postings = np.argsort(tokens, kind='stable').astype(np.uint32)
+        term_offsets = np.zeros(len(vocabulary) + 1, dtype=np.uint32)
+        term_offsets[1:] = np.cumsum(np.bincount(tokens, minlength=len(vocabulary)))
+
+        # Write into a temporary directory and rename, so readers never see partial segments
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.index_dir, prefix='.tmp-'))
+        arrays = {'tokens': tokens, 'starts': starts, 'doc_offsets': doc_offsets,
+                  'term_offsets': term_offsets, 'postings': postings}
+        for name, values in arrays.items():
+            np.save(tmp_dir / f"{name}.npy", values)
+        (tmp_dir / 'vocab.txt').write_text('\n'.join(vocabulary.words), encoding='utf-8')
+        with open(tmp_dir / 'docs.json', 'w') as f:
+            json.dump(docs, f)
+
+        segment_name = f"seg-{time.time_ns():x}"
+        os.replace(tmp_dir, self.index_dir / segment_name)
+        return segment_name
+
+    def _drop_dead_segments(self):
+        """Forget segments without live documents and delete unreferenced segment directories."""
+        live_segments = {entry['segment'] for entry in self.manifest['videos'].values()}
+        self.manifest['segments'] = [name for name in self.manifest['segments'] if name in live_segments]
+        for path in self.index_dir.iterdir():
+            if path.is_dir() and path.name not in live_segments:
+                shutil.rmtree(path, ignore_errors=True)
+
+    # Querying
+
+    def segments(self) -> List[IndexSegment]:
+        """Loaded segments with superseded documents masked out."""
+        if self._segments is None:
+            segments = [IndexSegment(self.index_dir / name) for name in self.manifest['segments']]
+            videos = self.manifest['videos']
+            for segment in segments:
+                for doc, entry in enumerate(segment.docs):
+                    current = videos.get(entry['video_id'], {})
+                    segment.live[doc] = current.get('segment') == segment.name and current.get('doc') == doc
+            self._segments = segments
+        return self._segments
+
+    def search(self, query: str, near: Optional[int] = None, first_seconds: Optional[float] = None,
+               last_seconds: Optional[float] = None) -> List[IndexHit]:
+        """Find a phrase, or all query terms within `near` words of the first one.
+
+        first_seconds/last_seconds keep hits within that many seconds of the
+        start/end of the video.
+        """
+        terms = [normalize_word(word) for word in query.split()]
+        if not terms:
+            return []
+
+        hits = []
+        for segment in self.segments():
+            if near is None:
+                offsets = self._phrase_offsets(segment, terms)
+            else:
+                offsets = self._near_offsets(segment, terms, near)
+            if not len(offsets):
+                continue
+
+            docs = segment.doc_of(offsets)
+            keep = segment.live[docs]
+            offsets, docs = offsets[keep], docs[keep]
+            times = segment.starts[offsets].astype(np.float64)
+            durations = segment.starts[segment.doc_offsets[docs + 1] - 1].astype(np.float64)
+
+            if first_seconds is not None:
+                keep = times <= first_seconds
+                offsets, docs, times, durations = offsets[keep], docs[keep], times[keep], durations[keep]
+            if last_seconds is not None:
+                keep = times >= durations - last_seconds
+                offsets, docs, times, durations = offsets[keep], docs[keep], times[keep], durations[keep]
+
+            positions = offsets - segment.doc_offsets[docs]
+            for doc, time_, position, duration in zip(docs.tolist(), times.tolist(),
+                                                     positions.tolist(), durations.tolist()):
+                hits.append(IndexHit(segment.docs[doc]['video_id'], time_, position, duration))
+
+        hits.sort(key=lambda hit: (hit.video_id, hit.time))
+        return hits
+
+    def _phrase_offsets(self, segment: IndexSegment, terms: List[str]) -> np.ndarray:
+        """Word offsets where the terms occur consecutively within one document."""
+        postings = [segment.term_postings(term) for term in terms]
+        if any(not len(p) for p in postings):
+            return np.empty(0, dtype=np.int64)
+
+        # Start from the rarest term and verify the others against the token stream
+        rarest = min(range(len(terms)), key=lambda i: len(postings[i]))
+        starts = postings[rarest].astype(np.int64) - rarest
+        starts = starts[starts >= 0]
+        ends = starts + len(terms) - 1
+        starts = starts[ends < len(segment.tokens)]
+        for i, term in enumerate(terms):
+            if i == rarest or not len(starts):
+                continue
+            term_id = segment.vocabulary.ids[term]
+            starts = starts[segment.tokens[starts + i] == term_id]
+
+        # Discard phrases that cross a document boundary
+        same_doc = segment.doc_of(starts) == segment.doc_of(starts + len(terms) - 1)
+        return starts[same_doc]
+
+    def _near_offsets(self, segment: IndexSegment, terms: List[str], near: int) -> np.ndarray:
+        """Occurrences of the first term with every other term within `near` words (same document)."""
+        anchors = segment.term_postings(terms[0]).astype(np.int64)
+        anchor_docs = segment.doc_of(anchors)
+        for term in terms[1:]:
+            if not len(anchors):
+                break
+            others = segment.term_postings(term).astype(np.int64)
+            if not len(others):
+                return np.empty(0, dtype=np.int64)
+            # First occurrence at or after anchor - near, not before the anchor's own document
+            lower = np.maximum(anchors - near, segment.doc_offsets[anchor_docs].astype(np.int64))
+            candidate = np.searchsorted(others, lower)
+            found = candidate < len(others)
+            closest = others[np.minimum(candidate, len(others) - 1)]
+            found &= (closest <= anchors + near) & (segment.doc_of(closest) == anchor_docs)
+            anchors, anchor_docs = anchors[found], anchor_docs[found]
+        return anchors
+
+    def snippet(self, hit: IndexHit, context_words: int = 6) -> str:
+        """Text around a hit."""
+        entry = self.manifest['videos'][hit.video_id]
+        segment = next(s for s in self.segments() if s.name == entry['segment'])
+        words, _ = segment.doc_words(entry['doc'])
+        begin = max(0, hit.word_position - context_words)
+        return ' '.join(words[begin:hit.word_position + context_words + 1])
+
+
+def corpus_transcripts(research_dir: Union[str, Path]) -> List[Tuple[str, Path]]:
+    """(video_id, transcript_file) for every video, resolved through the transcript store."""
+    return TranscriptStore(research_dir).transcripts()
+
+
+def _format_time(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Timestamped phrase search over transcripts')
+    parser.add_argument('--research-dir', default='research',
+                       help='Research directory (default: research)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Index new or changed transcripts')
+    build_parser.add_argument('--rebuild', action='store_true',
+                              help='Discard the existing index first')
+
+    query_parser = subparsers.add_parser('query', help='Search the index')
+    query_parser.add_argument('phrase', help='Words to search for')
+    query_parser.add_argument('--near', type=int,
+                              help='Match all words within N words of the first instead of the exact phrase')
+    query_parser.add_argument('--first', type=float,
+                              help='Only hits in the first N seconds of a video')
+    query_parser.add_argument('--last', type=float,
+                              help='Only hits in the last N seconds of a video')
+    query_parser.add_argument('--limit', type=int, default=20,
+                              help='Hits to print (default: 20, 0 for counts only)')
+
+    args = parser.parse_args()
+    index_dir = Path(args.research_dir) / '.cache' / 'index'
+
+    if args.command == 'build':
+        if args.rebuild:
+            shutil.rmtree(index_dir, ignore_errors=True)
+        index = TranscriptIndex(index_dir)
+        added = index.update(corpus_transcripts(args.research_dir),
+                             TranscriptCache(Path(args.research_dir) / '.cache' / 'transcripts'))
+        print(f"Indexed {added} new or changed videos ({len(index.manifest['videos'])} total)")
+        return
+
+    index = TranscriptIndex(index_dir)
+    if not index.manifest['videos']:
+        print("Index is empty, run the build command first")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    hits = index.search(args.phrase, near=args.near, first_seconds=args.first, last_seconds=args.last)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for hit in hits[:args.limit]:
+        print(f"{hit.video_id}  {_format_time(hit.time)}  {index.snippet(hit)}")
+    print(f"\n{len(hits)} hits in {len({hit.video_id for hit in hits})} videos ({elapsed_ms:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Content-addressed transcript store.
+yt-dlp writes several caption tracks per video (.en-orig.vtt, .en.vtt) that
+are often byte-identical. The store hashes them on ingest, keeps one canonical
+blob per video (en-orig preferred) and records every track's hash in a
+manifest, so consumers resolve exactly one transcript per video id.
+
+Layout:
+    research/transcript_store/manifest.json
+    research/transcript_store/blobs/<hash[:2]>/<hash>.vtt
+"""
+
+import argparse
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import logging
+
+from transcript_cache import file_hash
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Caption tracks in order of preference ('' is a plain <video_id>.vtt)
+TRACK_PREFERENCE = ('en-orig', 'en', '')
+
+
+def split_transcript_name(name: str) -> Optional[Tuple[str, str]]:
+    """(video_id, track) of a transcript file name such as "abc123.en-orig.vtt"."""
+    if not name.endswith('.vtt'):
+        return None
+    # Video ids never contain dots; the track is whatever sits between id and extension
+    video_id, _, track = name[:-len('.vtt')].partition('.')
+    return video_id, track
+
+
+def track_rank(track: str) -> int:
+    return TRACK_PREFERENCE.index(track) if track in TRACK_PREFERENCE else len(TRACK_PREFERENCE)
+
+
+class TranscriptStore:
+    """One canonical, content-addressed transcript per video."""
+
+    def __init__(self, research_dir: Union[str, Path] = "research"):
+        self.research_dir = Path(research_dir)
+        self.transcripts_dir = self.research_dir / "transcripts"  # yt-dlp downloads and legacy files
+        self.root = self.research_dir / "transcript_store"
+        self.blobs_dir = self.root / "blobs"
+        self.manifest_file = self.root / "manifest.json"
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict:
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Could not load transcript manifest: {e}")
+        return {'videos': {}}
+
+    def _save_manifest(self):
+        tmp_file = self.manifest_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.manifest_file)
+
+    def blob_path(self, content_hash: str) -> Path:
+        return self.blobs_dir / content_hash[:2] / f"{content_hash}.vtt"
+
+    # Ingest
+
+    def ingest_video(self, video_id: str, remove_sources: bool = False) -> Optional[Path]:
+        """Store the caption tracks downloaded for a video; returns the canonical blob."""
+        files = [path for path in self.transcripts_dir.glob(f"{video_id}.*")
+                 if (split_transcript_name(path.name) or (None,))[0] == video_id]
+        if not files:
+            return None
+        return self.ingest(video_id, files, remove_sources)
+
+    def ingest(self, video_id: str, files: List[Path], remove_sources: bool = False) -> Path:
+        """Hash every track of a video and keep the preferred one as its canonical blob."""
+        tracks = {}
+        for path in files:
+            _, track = split_transcript_name(path.name)
+            tracks[track] = (path, file_hash(path))
+
+        canonical = min(tracks, key=track_rank)
+        source, content_hash = tracks[canonical]
+        blob = self.blob_path(content_hash)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp_blob = blob.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            if remove_sources:
+                shutil.move(str(source), tmp_blob)
+            else:
+                shutil.copyfile(source, tmp_blob)
+            os.replace(tmp_blob, blob)
+
+        with self._lock:
+            self.manifest['videos'][video_id] = {
+                'hash': content_hash,
+                'track': canonical,
+                'tracks': {track: track_hash for track, (_, track_hash) in sorted(tracks.items())},
+                'ingested_at': datetime.now().isoformat()
+            }
+            self._save_manifest()
+
+        if remove_sources:
+            for path, _ in tracks.values():
+                if path.exists():
+                    path.unlink()
+        return blob
+
+    def ingest_directory(self, remove_sources: bool = False) -> int:
+        """Import every transcript in the transcripts directory; returns videos ingested."""
+        by_video: Dict[str, List[Path]] = {}
+        for path in sorted(self.transcripts_dir.glob("*.vtt")):
+            video_id, _ = split_transcript_name(path.name)
+            by_video.setdefault(video_id, []).append(path)
+
+        for video_id, files in by_video.items():
+            self.ingest(video_id, files, remove_sources)
+        return len(by_video)
+
+    # Lookup
+
+    def resolve(self, video_id: str) -> Optional[Path]:
+        """The one transcript file to use for a video (stored blob, else preferred legacy file)."""
+        entry = self.manifest['videos'].get(video_id)
+        if entry:
+            blob = self.blob_path(entry['hash'])
+            if blob.exists():
+                return blob
+            logger.warning(f"Blob missing for {video_id}: {blob}")
+
+        for track in TRACK_PREFERENCE:
+            path = self.transcripts_dir / (f"{video_id}.{track}.vtt" if track else f"{video_id}.vtt")
+            if path.exists():
+                return path
+        return None
+
+    def video_id_of(self, transcript_file: Union[str, Path]) -> str:
+        """Video id of a blob or a per-track transcript file."""
+        path = Path(transcript_file)
+        if path.parent.parent == self.blobs_dir:
+            for video_id, entry in sorted(self.manifest['videos'].items()):
+                if entry['hash'] == path.stem:
+                    return video_id
+        return split_transcript_name(path.name)[0] if path.name.endswith('.vtt') else path.stem
+
+    def transcripts(self) -> List[Tuple[str, Path]]:
+        """(video_id, transcript_file) for every known video, one file each, sorted by id."""
+        video_ids = set(self.manifest['videos'])
+        for path in self.transcripts_dir.glob("*.vtt"):
+            video_ids.add(split_transcript_name(path.name)[0])
+
+        transcripts = []
+        for video_id in sorted(video_ids):
+            transcript_file = self.resolve(video_id)
+            if transcript_file:
+                transcripts.append((video_id, transcript_file))
+        return transcripts
+
+    def stats(self) -> Dict:
+        """Disk use of the store versus the files still in the transcripts directory."""
+        blobs = list(self.blobs_dir.glob("*/*.vtt"))
+        legacy = list(self.transcripts_dir.glob("*.vtt"))
+        entries = self.manifest['videos'].values()
+        return {
+            'videos': len(self.manifest['videos']),
+            'blobs': len(blobs),
+            'blob_bytes': sum(path.stat().st_size for path in blobs),
+            'identical_track_videos': sum(1 for entry in entries if len(set(entry['tracks'].values())) == 1
+                                          and len(entry['tracks']) > 1),
+            'legacy_files': len(legacy),
+            'legacy_bytes': sum(path.stat().st_size for path in legacy)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Content-addressed transcript store')
+    parser.add_argument('--research-dir', default='research',
+                       help='Research directory (default: research)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='Ingest the transcripts directory')
+    import_parser.add_argument('--remove-sources', action='store_true',
+                               help='Delete the per-track files once stored')
+    subparsers.add_parser('stats', help='Show disk use')
+
+    args = parser.parse_args()
+    store = TranscriptStore(args.research_dir)
+
+    if args.command == 'import':
+        count = store.ingest_directory(args.remove_sources)
+        print(f"Ingested {count} videos into {store.root}")
+
+    stats = store.stats()
+    print(f"Videos: {stats['videos']} ({stats['identical_track_videos']} with byte-identical tracks)")
+    print(f"Blobs: {stats['blobs']} files, {stats['blob_bytes'] / 1e6:.1f} MB")
+    print(f"Transcripts directory: {stats['legacy_files']} files, {stats['legacy_bytes'] / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
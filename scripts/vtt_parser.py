@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Streaming WebVTT parser shared by the transcript analyzers.
+Reads a .vtt file line by line and yields cues with their inline word timings.
+"""
+
+import html
+import re
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+# Bump when parsing or de-duplication output changes (invalidates cached transcripts)
+PARSER_VERSION = 1
+
+# Inline karaoke timestamp, e.g. <00:00:02.240>
+INLINE_TIMESTAMP = re.compile(r'<(\d+:\d{2}:\d{2}\.\d{3})>')
+# Any other markup tag (<c>, </c>, <c.colorE5E5E5>, ...)
+MARKUP_TAG = re.compile(r'<[^>]*>')
+
+# Number of recently emitted words a new cue may overlap with
+DEDUP_WINDOW = 64
+
+
+class Cue(NamedTuple):
+    """A single caption cue."""
+    start: float
+    end: float
+    text: str  # Cleaned caption lines joined with '\n'
+    words: Tuple[Tuple[float, str], ...]  # (start_seconds, word) for every word in the cue
+
+
+def parse_timestamp(timestamp_str: str) -> float:
+    """Parse a VTT timestamp (HH:MM:SS.mmm or MM:SS.mmm) to seconds."""
+    try:
+        time_parts = timestamp_str.strip().split(':')
+        seconds = float(time_parts[-1])
+        minutes = int(time_parts[-2]) if len(time_parts) >= 2 else 0
+        hours = int(time_parts[-3]) if len(time_parts) >= 3 else 0
+        return hours * 3600 + minutes * 60 + seconds
+    except (ValueError, IndexError):
+        return 0.0
+
+
+def _clean_text(text: str) -> str:
+    """Strip markup tags and decode entities such as &nbsp;."""
+    return html.unescape(MARKUP_TAG.sub('', text))
+
+
+def _parse_cue_line(line: str, cue_start: float) -> Tuple[str, List[Tuple[float, str]]]:
+    """Clean one caption line and collect its words with their start times.
+
+    Words before the first inline timestamp start with the cue itself.
+    """
+    if '<' not in line:
+        clean_line = html.unescape(line).strip()
+        return clean_line, [(cue_start, word) for word in clean_line.split()]
+
+    words = []
+    parts = INLINE_TIMESTAMP.split(line)
+    # parts alternates: text, timestamp, text, timestamp, text, ...
+    word_time = cue_start
+    for i, part in enumerate(parts):
+        if i % 2:
+            word_time = parse_timestamp(part)
+            continue
+        for word in _clean_text(part).split():
+            words.append((word_time, word))
+
+    clean_line = ' '.join(_clean_text(part) for part in parts[::2]).strip()
+    return ' '.join(clean_line.split()), words
+
+
+def iter_cues(vtt_file: Union[str, Path]) -> Iterator[Cue]:
+    """Stream cues from a VTT file without loading it into memory."""
+    with open(vtt_file, 'r', encoding='utf-8') as f:
+        in_cue = False
+        skip_block = False
+        start = end = 0.0
+        lines: List[str] = []
+        words: List[Tuple[float, str]] = []
+
+        for raw_line in f:
+            raw_line = raw_line.rstrip('\r\n')
+            line = raw_line.strip()
+
+            if not raw_line:
+                # Blank line terminates the current block
+                if in_cue and lines:
+                    yield Cue(start, end, '\n'.join(lines), tuple(words))
+                in_cue = skip_block = False
+                lines = []
+                words = []
+                continue
+
+            if skip_block or not line:
+                # Whitespace-only caption lines are padding, not separators
+                continue
+
+            if '-->' in line:
+                # Format: 00:00:15.120 --> 00:00:18.040 align:start position:0%
+                if in_cue and lines:
+                    yield Cue(start, end, '\n'.join(lines), tuple(words))
+                    lines = []
+                    words = []
+                start_str, _, rest = line.partition('-->')
+                end_str = rest.split()[0] if rest.split() else ''
+                start = parse_timestamp(start_str)
+                end = parse_timestamp(end_str)
+                in_cue = True
+                continue
+
+            if not in_cue:
+                # Header, NOTE/STYLE/REGION blocks and cue identifiers
+                if line.startswith(('NOTE', 'STYLE', 'REGION')):
+                    skip_block = True
+                continue
+
+            clean_line, line_words = _parse_cue_line(line, start)
+            if clean_line:
+                lines.append(clean_line)
+                words.extend(line_words)
+
+        if in_cue and lines:
+            yield Cue(start, end, '\n'.join(lines), tuple(words))
+
+
+def _overlap_length(tail: List[str], tokens: List[str]) -> int:
+    """Length of the longest prefix of tokens that is also a suffix of tail.
+
+    Uses the KMP prefix function over tokens + separator + tail, so the cost
+    is linear in the size of the cue and the window.
+    """
+    sequence = tokens + [None] + tail
+    prefix = [0] * len(sequence)
+    for i in range(1, len(sequence)):
+        k = prefix[i - 1]
+        while k and sequence[i] != sequence[k]:
+            k = prefix[k - 1]
+        if sequence[i] == sequence[k]:
+            k += 1
+        prefix[i] = k
+    return prefix[-1] if tail else 0
+
+
+def deduplicate_cues(cues: Iterable[Cue], window: int = DEDUP_WINDOW) -> Iterator[Cue]:
+    """Rebuild the unique spoken word stream from rolling captions.
+
+    YouTube auto-captions repeat the previous line at the top of each cue.
+    Every cue is reduced to the words that extend the stream emitted so far;
+    cues that add nothing are dropped.
+    """
+    tail = deque(maxlen=window)
+    for cue in cues:
+        tokens = [word for _, word in cue.words]
+        overlap = _overlap_length(list(tail)[-len(tokens):], tokens)
+        new_words = cue.words[overlap:]
+        if not new_words:
+            continue
+        tail.extend(word for _, word in new_words)
+        yield Cue(cue.start, cue.end, ' '.join(word for _, word in new_words), new_words)
+
+
+def iter_deduplicated_cues(vtt_file: Union[str, Path], window: int = DEDUP_WINDOW) -> Iterator[Cue]:
+    """Stream de-duplicated cues from a VTT file."""
+    return deduplicate_cues(iter_cues(vtt_file), window)
+
+
+def transcript_text(vtt_file: Union[str, Path]) -> str:
+    """Plain text of the unique spoken word stream."""
+    return ' '.join(cue.text for cue in iter_deduplicated_cues(vtt_file))
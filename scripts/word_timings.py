@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Word-level timing arrays extracted from inline karaoke tags in auto-captions.
+Each video becomes two parallel arrays (float32 start times, uint32 token ids)
+so rate and pause statistics can run as vectorized NumPy operations.
+"""
+
+import string
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from vtt_parser import iter_deduplicated_cues
+
+_PUNCTUATION = string.punctuation + '‘’“”…'
+
+
+def normalize_word(word: str) -> str:
+    """Lowercase a word and strip surrounding punctuation."""
+    normalized = word.strip(_PUNCTUATION).lower()
+    return normalized or word.lower()
+
+
+class Vocabulary:
+    """Maps normalized words to dense uint32 token ids."""
+
+    def __init__(self, words: Optional[Iterable[str]] = None):
+        self.words: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for word in words or []:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def add(self, word: str) -> int:
+        """Return the id for an already-normalized word, assigning one if new."""
+        token_id = self.ids.get(word)
+        if token_id is None:
+            token_id = len(self.words)
+            self.ids[word] = token_id
+            self.words.append(word)
+        return token_id
+
+    def encode(self, word: str) -> int:
+        """Normalize a raw word and return its token id."""
+        return self.add(normalize_word(word))
+
+    def decode(self, token_ids: Iterable[int]) -> List[str]:
+        """Map token ids back to normalized words."""
+        return [self.words[token_id] for token_id in token_ids]
+
+
+class WordTimings(NamedTuple):
+    """Parallel per-word arrays for one video."""
+    starts: np.ndarray  # float32 seconds
+    token_ids: np.ndarray  # uint32 ids into vocabulary
+    vocabulary: Vocabulary
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+def extract_word_timings(vtt_file: Union[str, Path],
+                         vocabulary: Optional[Vocabulary] = None) -> WordTimings:
+    """Build word timing arrays from the de-duplicated word stream of a VTT file.
+
+    Pass a shared vocabulary to get token ids that are comparable across videos.
+    """
+    if vocabulary is None:
+        vocabulary = Vocabulary()
+
+    starts = array('f')
+    token_ids = array('I')
+    for cue in iter_deduplicated_cues(vtt_file):
+        for start, word in cue.words:
+            starts.append(start)
+            token_ids.append(vocabulary.encode(word))
+
+    return WordTimings(
+        np.frombuffer(starts, dtype=np.float32),
+        np.frombuffer(token_ids, dtype=np.uint32),
+        vocabulary
+    )
+
+
+def words_per_minute(starts: np.ndarray) -> float:
+    """Average speaking rate over the span covered by the words."""
+    if len(starts) < 2:
+        return 0.0
+    span = float(starts[-1] - starts[0])
+    return len(starts) / span * 60 if span > 0 else 0.0
+
+
+def word_gaps(starts: np.ndarray) -> np.ndarray:
+    """Time between consecutive word starts (len(starts) - 1 values)."""
+    return np.diff(starts)
+
+
+def find_pauses(starts: np.ndarray, min_gap: float = 1.5) -> np.ndarray:
+    """Indices of words that are followed by a gap of at least min_gap seconds."""
+    return np.flatnonzero(word_gaps(starts) >= min_gap)
@@ -3,15 +3,61 @@
 Calculate total watch hours and analyze channel performance efficiency.
 """
 
-import json
+import argparse
+import sys
 from pathlib import Path
 
-def calculate_watch_hours():
-    """Calculate total watch hours for each channel."""
+sys.path.insert(0, str(Path(__file__).parent / 'scripts'))
+from accumulators import AccumulatorSet, load_partials, parse_shard, shard_of, write_partial
+from corpus_store import CorpusStore
+
+PARTIALS_DIR = Path('research') / 'structure_analysis' / 'partials'
+PARTIAL_PREFIX = 'watch-hours'
+
+def channel_accumulators(store, shard=(0, 1)):
+    """Mergeable view, duration and watch-hour totals per channel for one shard of the videos."""
+    shard_index, shard_count = shard
+    channels = {}
+    for channel_name in store.channel_names():
+        accumulators = AccumulatorSet()
+        for video in store.channel_videos(channel_name):
+            if shard_of(video['id'], shard_count) != shard_index:
+                continue
+            views = video['view_count']
+            duration = float(video['duration'])
+            
+            accumulators.add('views', views)
+            accumulators.add('duration', duration)
+            accumulators.add('watch_hours', (views * duration) / 3600)  # Convert to hours
+        channels[channel_name] = accumulators
+    return channels
+
+def write_shard(shard):
+    """Write one shard's watch-hour accumulators for a later --reduce."""
+    store = CorpusStore.open('research')
+    channels = channel_accumulators(store, shard)
+    return write_partial(PARTIALS_DIR, PARTIAL_PREFIX, shard, {
+        'channels': {name: accumulators.to_dict() for name, accumulators in channels.items()}
+    })
+
+def reduce_shards():
+    """Merge every shard's watch-hour accumulators."""
+    channels = {}
+    for partial in load_partials(PARTIALS_DIR, PARTIAL_PREFIX):
+        for channel_name, accumulators in partial['channels'].items():
+            channels.setdefault(channel_name, AccumulatorSet()).merge(AccumulatorSet.from_dict(accumulators))
+    return channels
+
+def calculate_watch_hours(channels=None):
+    """Calculate total watch hours for each channel.
+    
+    channels maps channel names to watch-hour accumulators (merged shard
+    results); by default they are computed from the whole corpus store.
+    """
     
     # Load analysis data
-    with open('research/analysis_summary.json', 'r') as f:
-        data = json.load(f)
+    if channels is None:
+        channels = channel_accumulators(CorpusStore.open('research'))
     
     print("📊 HORROR CHANNEL WATCH HOURS ANALYSIS")
     print("=" * 60)
@@ -48,32 +94,23 @@ def calculate_watch_hours():
     })
     
     # Calculate stats for other channels
-    for channel_name, channel_data in data['channels'].items():
-        if channel_data['videos_found'] == 0:
+    for channel_name, accumulators in channels.items():
+        video_count = accumulators['views'].count
+        if not video_count:
             continue
-            
-        total_views = 0
-        total_duration = 0
-        total_watch_hours = 0
-        
-        for video in channel_data['videos']:
-            views = video['view_count']
-            duration = float(video['duration'])
-            
-            total_views += views
-            total_duration += duration
-            total_watch_hours += (views * duration) / 3600  # Convert to hours
         
-        avg_duration = total_duration / len(channel_data['videos'])
+        total_views = int(accumulators['views'].total)
+        total_watch_hours = accumulators['watch_hours'].sum
+        avg_duration = accumulators['duration'].mean
         
         channel_stats.append({
             'name': channel_name,
-            'videos': channel_data['videos_found'],
+            'videos': video_count,
             'total_views': total_views,
             'total_watch_hours': total_watch_hours,
             'avg_duration_mins': avg_duration / 60,
-            'avg_views_per_video': total_views / channel_data['videos_found'],
-            'watch_hours_per_video': total_watch_hours / channel_data['videos_found']
+            'avg_views_per_video': total_views / video_count,
+            'watch_hours_per_video': total_watch_hours / video_count
         })
     
     # Sort by total watch hours (descending)
@@ -124,5 +161,21 @@ def calculate_watch_hours():
     
     return channel_stats
 
+def main():
+    parser = argparse.ArgumentParser(description='Channel watch hours analysis')
+    parser.add_argument('--shard', type=parse_shard, metavar='INDEX/COUNT',
+                       help='Only total this shard of the videos and write a partial result')
+    parser.add_argument('--reduce', action='store_true',
+                       help='Report from the merged shard partials')
+    
+    args = parser.parse_args()
+    
+    if args.shard:
+        print(f"Shard written to {write_shard(args.shard)}")
+    elif args.reduce:
+        calculate_watch_hours(reduce_shards())
+    else:
+        calculate_watch_hours()
+
 if __name__ == '__main__':
-    calculate_watch_hours()
\ No newline at end of file
+    main()
\ No newline at end of file